@@ -1,13 +1,30 @@
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter
 from rest_framework.viewsets import ModelViewSet
 
+from core.budgets import query_budget
+from core.cache import get_versions
+from core.routers import read_only
+from core.views import make_etag
 from exams.models import Exam
+from exams.pages import CATALOG_PAGES
 
 from .pagination import ExamPagination
 from .serializers import ExamSerializer
 
 
+def exams_etag(request: object, **kwargs) -> str:
+    return make_etag(
+        request.get_full_path(), request.META.get('HTTP_ACCEPT'),
+        get_versions((CATALOG_PAGES,))
+    )
+
+
+@query_budget(6)
+@read_only
+@method_decorator(condition(etag_func=exams_etag), name='dispatch')
 class ExamViewSet(ModelViewSet):
     serializer_class = ExamSerializer
     queryset = Exam.objects.filter(
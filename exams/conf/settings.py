@@ -10,7 +10,7 @@ SECRET_KEY = os.getenv(
     'DJANGO_SECRET_KEY',
     default="change-me-in-env-if-the-project-is-not-running-in-demo")
 
-DEBUG = True
+DEBUG = os.getenv('DJANGO_DEBUG', default='True') == 'True'
 
 ALLOWED_HOSTS = []
 
@@ -29,7 +29,6 @@ INSTALLED_APPS = [
     'users',
     'progress',
     'exams.apps.ExamsConfig',
-    'debug_toolbar',
     'widget_tweaks',
     'ckeditor',
     'ckeditor_uploader',
@@ -37,6 +36,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ProfilingMiddleware',
+    'core.middleware.QueryBudgetMiddleware',
+    'core.middleware.SlowQueryMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -44,13 +47,67 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'debug_toolbar.middleware.DebugToolbarMiddleware',
 ]
 
+if DEBUG:
+    INSTALLED_APPS.append('debug_toolbar')
+    MIDDLEWARE.append('debug_toolbar.middleware.DebugToolbarMiddleware')
+
+QUERY_BUDGET_RAISE = DEBUG
+
 INTERNAL_IPS = [
     '127.0.0.1',
 ]
 
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', default=0))
+
+PROFILING_LOG_FILE = os.getenv(
+    'PROFILING_LOG_FILE', default=os.path.join(BASE_DIR, 'profiling.log'))
+
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', default='')
+
+SLOW_QUERY_THRESHOLD_MS = float(
+    os.getenv('SLOW_QUERY_THRESHOLD_MS', default=200))
+
+SLOW_QUERY_EXPLAIN_ANALYZE = (
+    os.getenv('SLOW_QUERY_EXPLAIN_ANALYZE', default='False') == 'True')
+
+SLOW_QUERY_LOG_FILE = os.getenv(
+    'SLOW_QUERY_LOG_FILE', default=os.path.join(BASE_DIR, 'slow_queries.log'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'profiling': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': PROFILING_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'core.profiling': {
+            'handlers': ['profiling'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+        'core.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 ROOT_URLCONF = 'conf.urls'
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
@@ -84,13 +141,61 @@ DATABASES = {
     }
 }
 
+if os.getenv('DB_PARITY_ENGINE'):
+    DATABASES['parity'] = dict(
+        DATABASES['default'],
+        ENGINE=os.getenv('DB_PARITY_ENGINE'),
+        NAME=os.getenv(
+            'DB_PARITY_NAME', default=os.path.join(BASE_DIR, 'parity.sqlite3'))
+    )
+
+DATABASE_REPLICAS = []
+
+for number, host in enumerate(
+    filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(',')), 1
+):
+    DATABASES[f'replica_{number}'] = dict(
+        DATABASES['default'], HOST=host.strip(), TEST={'MIRROR': 'default'})
+    DATABASE_REPLICAS.append(f'replica_{number}')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', default=10))
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'exams_cache_table',
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'default',
+        'OPTIONS': {
+            'SHARED_CACHE': 'shared',
+            'LOCAL_TIMEOUT': 60,
+            'MAX_ENTRIES': 1000,
+        }
+    },
+    'shared': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='core.cache.LockingFileBasedCache'),
+        'LOCATION': os.getenv(
+            'CACHE_LOCATION', default=os.path.join(BASE_DIR, 'cache')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        }
     }
 }
 
+EXAM_SNAPSHOT_TIMEOUT = 60 * 60
+
+EXAM_STATS_TIMEOUT = 5 * 60
+
+CATEGORY_COUNTS_TIMEOUT = 5 * 60
+
+RANKINGS_TIMEOUT = 60 * 60
+
+PAGE_CACHE_TIMEOUT = 10 * 60
+
+PROGRESS_ARCHIVE_DAYS = int(os.getenv('PROGRESS_ARCHIVE_DAYS', default=365))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME':
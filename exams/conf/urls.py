@@ -4,8 +4,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from core.views import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics, name='metrics'),
     url(r'^ckeditor/', include('ckeditor_uploader.urls')),
     path('api/1.0/', include('api.urls', namespace='api')),
     path('', include('exams.urls', namespace='exams')),
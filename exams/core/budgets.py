@@ -0,0 +1,92 @@
+import logging
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from time import perf_counter
+
+from django.db import connections
+from django.urls import resolve
+
+logger = logging.getLogger('core.budgets')
+
+
+class QueryBudgetError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    queries: int
+    time_ms: float = None
+
+    def check(self, recorder: object, view_name: str) -> list:
+        errors = []
+        if recorder.count > self.queries:
+            errors.append(
+                f'{view_name}: {recorder.count} SQL-запросов '
+                f'при бюджете {self.queries}'
+            )
+        if self.time_ms is not None and recorder.time_ms > self.time_ms:
+            errors.append(
+                f'{view_name}: {recorder.time_ms:.1f} мс в SQL '
+                f'при бюджете {self.time_ms} мс'
+            )
+        return errors
+
+
+class QueryRecorder:
+
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if sql != 'BEGIN':
+                self.count += 1
+            self.time_ms += (perf_counter() - start) * 1000
+
+
+@contextmanager
+def record_queries() -> object:
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def query_budget(queries: int, time_ms: float = None) -> object:
+    def decorator(view):
+        view.query_budget = QueryBudget(queries, time_ms)
+        return view
+    return decorator
+
+
+def get_view_budget(view_func: object) -> QueryBudget:
+    view_class = (
+        getattr(view_func, 'view_class', None)
+        or getattr(view_func, 'cls', None)
+    )
+    return (
+        getattr(view_func, 'query_budget', None)
+        or getattr(view_class, 'query_budget', None)
+    )
+
+
+def assert_query_budget(client: object, url: str, method: str = 'get',
+                        data: dict = None, **extra) -> object:
+    match = resolve(url.split('?')[0])
+    budget = get_view_budget(match.func)
+    if budget is None:
+        raise QueryBudgetError(f'{match.view_name}: бюджет не объявлен')
+
+    with record_queries() as recorder:
+        response = getattr(client, method)(url, data, **extra)
+
+    errors = budget.check(recorder, match.view_name)
+    if errors:
+        raise QueryBudgetError('; '.join(errors))
+    return response
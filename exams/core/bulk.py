@@ -0,0 +1,24 @@
+from django.db import connections, router, transaction
+
+
+def bulk_create(model: object, objects: list, batch_size: int = None) -> list:
+    using = router.db_for_write(model)
+    manager = model._base_manager.using(using)
+    if connections[using].features.can_return_rows_from_bulk_insert:
+        return manager.bulk_create(objects, batch_size=batch_size)
+
+    fields = [
+        field for field in model._meta.concrete_fields
+        if field not in model._meta.db_returning_fields
+    ]
+    with transaction.atomic(using=using, savepoint=False):
+        for obj in objects:
+            rows = manager._insert(
+                [obj], fields=fields, using=using,
+                returning_fields=model._meta.db_returning_fields
+            )
+            for field, value in zip(model._meta.db_returning_fields, rows[0]):
+                setattr(obj, field.attname, value)
+            obj._state.adding = False
+            obj._state.db = using
+    return objects
@@ -0,0 +1,284 @@
+import fcntl
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from math import log
+from random import random
+from threading import Lock
+from time import monotonic, sleep, time
+from uuid import uuid4
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.filebased import FileBasedCache
+
+from .profiling import record_cache
+
+_stores = {}
+_stores_lock = Lock()
+_missing = object()
+
+
+class LocalStore:
+
+    def __init__(self):
+        self.lock = Lock()
+        self.entries = OrderedDict()
+        self.counters = dict.fromkeys(
+            ('local_hits', 'shared_hits', 'misses'), 0)
+
+    def count(self, local_hits=0, shared_hits=0, misses=0):
+        with self.lock:
+            self.counters['local_hits'] += local_hits
+            self.counters['shared_hits'] += shared_hits
+            self.counters['misses'] += misses
+        record_cache(local_hits + shared_hits, misses)
+
+
+class TieredCache(BaseCache):
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED_CACHE', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 60)
+        with _stores_lock:
+            self.store = _stores.setdefault(location, LocalStore())
+
+    @property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get_local(self, key):
+        now = monotonic()
+        with self.store.lock:
+            expires, pickled = self.store.entries.get(key, (0, None))
+            if expires <= now:
+                self.store.entries.pop(key, None)
+                return _missing
+            self.store.entries.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def set_local(self, key, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_timeout(timeout)
+        if timeout is not None and timeout <= 0:
+            self.delete_local(key)
+            return
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        expires = monotonic() + min(
+            self.local_timeout, timeout or self.local_timeout)
+
+        with self.store.lock:
+            self.store.entries[key] = (expires, pickled)
+            self.store.entries.move_to_end(key)
+            while len(self.store.entries) > self._max_entries:
+                self.store.entries.popitem(last=False)
+
+    def delete_local(self, key):
+        with self.store.lock:
+            self.store.entries.pop(key, None)
+
+    def get_timeout(self, timeout=DEFAULT_TIMEOUT):
+        if timeout == DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return timeout
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self.set_local(self.make_key(key, version), value, timeout)
+        return added
+
+    def get(self, key, default=None, version=None):
+        local_key = self.make_key(key, version)
+        self.validate_key(local_key)
+        value = self.get_local(local_key)
+        if value is not _missing:
+            self.store.count(local_hits=1)
+            return value
+
+        value = self.shared.get(key, _missing, version)
+        if value is _missing:
+            self.store.count(misses=1)
+            return default
+        self.store.count(shared_hits=1)
+        self.set_local(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version)
+        self.set_local(self.make_key(key, version), value, timeout)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        self.delete_local(self.make_key(key, version))
+        return self.shared.touch(key, timeout, version)
+
+    def delete(self, key, version=None):
+        self.delete_local(self.make_key(key, version))
+        return self.shared.delete(key, version)
+
+    def get_many(self, keys, version=None):
+        values = {}
+        missing = []
+
+        for key in keys:
+            value = self.get_local(self.make_key(key, version))
+            if value is _missing:
+                missing.append(key)
+            else:
+                values[key] = value
+
+        shared_values = self.shared.get_many(missing, version)
+        for key, value in shared_values.items():
+            self.set_local(self.make_key(key, version), value)
+        values.update(shared_values)
+
+        self.store.count(
+            local_hits=len(keys) - len(missing),
+            shared_hits=len(shared_values),
+            misses=len(missing) - len(shared_values)
+        )
+        return values
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version)
+        for key, value in data.items():
+            if key not in failed:
+                self.set_local(self.make_key(key, version), value, timeout)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        for key in keys:
+            self.delete_local(self.make_key(key, version))
+        self.shared.delete_many(keys, version)
+
+    def has_key(self, key, version=None):
+        if self.get_local(self.make_key(key, version)) is not _missing:
+            return True
+        return self.shared.has_key(key, version)
+
+    def incr(self, key, delta=1, version=None):
+        self.delete_local(self.make_key(key, version))
+        return self.shared.incr(key, delta, version)
+
+    def clear(self):
+        with self.store.lock:
+            self.store.entries.clear()
+        self.shared.clear()
+
+    def stats(self):
+        with self.store.lock:
+            return dict(self.store.counters, size=len(self.store.entries))
+
+
+class LockingFileBasedCache(FileBasedCache):
+
+    def __init__(self, dir, params):
+        super().__init__(dir, params)
+        self.lock_dir = os.path.join(os.path.abspath(dir), 'locks')
+        self.file_locks = {}
+
+    def get_lock_path(self, key):
+        name = hashlib.md5(self.make_key(key).encode()).hexdigest()
+        return os.path.join(self.lock_dir, f'{name}.lock')
+
+    def acquire_lock(self, key):
+        os.makedirs(self.lock_dir, 0o700, exist_ok=True)
+        path = self.get_lock_path(key)
+        descriptor = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(descriptor, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(descriptor)
+            return False
+        self.file_locks[path] = descriptor
+        return True
+
+    def release_lock(self, key):
+        descriptor = self.file_locks.pop(self.get_lock_path(key), None)
+        if descriptor is not None:
+            fcntl.flock(descriptor, fcntl.LOCK_UN)
+            os.close(descriptor)
+
+
+def get_shared_cache() -> BaseCache:
+    cache = caches['default']
+    return getattr(cache, 'shared', cache)
+
+
+def acquire_lock(cache, key, timeout):
+    if isinstance(cache, LockingFileBasedCache):
+        return cache.acquire_lock(key)
+    return cache.add(f'{key}:lock', True, timeout)
+
+
+def release_lock(cache, key):
+    if isinstance(cache, LockingFileBasedCache):
+        cache.release_lock(key)
+    else:
+        cache.delete(f'{key}:lock')
+
+
+def refresh(cache, key, compute, timeout, stale_timeout):
+    start = monotonic()
+    try:
+        value = compute()
+        cache.set(
+            key, (value, time() + timeout, monotonic() - start),
+            timeout + stale_timeout
+        )
+    finally:
+        release_lock(cache, key)
+    return value
+
+
+def get_or_compute(key, compute, timeout, stale_timeout=None,
+                   lock_timeout=30, wait=5, beta=1.0):
+    cache = get_shared_cache()
+    if stale_timeout is None:
+        stale_timeout = timeout
+    entry = cache.get(key)
+
+    if entry is not None:
+        value, expires, delta = entry
+        if time() - delta * beta * log(1 - random()) < expires:
+            return value
+        if not acquire_lock(cache, key, lock_timeout):
+            return value
+        return refresh(cache, key, compute, timeout, stale_timeout)
+
+    if acquire_lock(cache, key, lock_timeout):
+        return refresh(cache, key, compute, timeout, stale_timeout)
+
+    deadline = monotonic() + wait
+    while monotonic() < deadline:
+        sleep(0.05)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry[0]
+    return compute()
+
+
+def mark_stale(key, stale_timeout):
+    cache = get_shared_cache()
+    entry = cache.get(key)
+    if entry is not None:
+        value, _, delta = entry
+        cache.set(key, (value, 0, delta), stale_timeout)
+
+
+def get_versions(names: tuple) -> dict:
+    cache = get_shared_cache()
+    keys = {f'version:{name}': name for name in names}
+    versions = cache.get_many(keys)
+
+    for key in keys.keys() - versions.keys():
+        cache.add(key, uuid4().hex, None)
+        versions[key] = cache.get(key)
+    return {keys[key]: version for key, version in versions.items()}
+
+
+def bump_versions(*names) -> None:
+    get_shared_cache().set_many(
+        {f'version:{name}': uuid4().hex for name in names}, None)
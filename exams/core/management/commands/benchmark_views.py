@@ -0,0 +1,199 @@
+import json
+import subprocess
+from statistics import median
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+
+from core.budgets import get_view_budget
+from exams.models import Exam, Question, Variant
+from exams.snapshots import get_exam_snapshot
+from progress.models import ArchivedProgress, Progress, UserAnswer
+from users.models import User
+
+SCALE_MODELS = {
+    'users': User,
+    'exams': Exam,
+    'questions': Question,
+    'variants': Variant,
+    'progress': Progress,
+    'answers': UserAnswer,
+    'archived_progress': ArchivedProgress
+}
+
+
+class Command(BaseCommand):
+    help = ('Замеряет время ответа и количество SQL-запросов основных '
+            'страниц и API, результат сохраняется в JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Путь к JSON-отчету, по умолчанию стандартный вывод')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--user', help='Имя пользователя, от которого идут запросы')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Завершиться с ошибкой, если превышен бюджет SQL-запросов')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.client = Client(HTTP_HOST='localhost', REMOTE_ADDR='192.0.2.1')
+        user = self.get_user(options['user'])
+        exam = (
+            Exam.objects
+            .filter(active=True, visibility=True, allow_retesting=True)
+            .annotate(count=Count(
+                'questions',
+                filter=Q(questions__active=True, questions__visibility=True)
+            ))
+            .order_by('-count')
+            .first()
+        )
+        if exam is None:
+            raise CommandError('Нет опубликованных тестов')
+
+        with transaction.atomic():
+            views = self.run_cases(user, exam)
+            transaction.set_rollback(True)
+
+        report = {
+            'date': timezone.now().isoformat(),
+            'commit': self.get_commit(),
+            'repeat': self.repeat,
+            'scale': {
+                name: model.objects.count()
+                for name, model in SCALE_MODELS.items()
+            },
+            'views': views
+        }
+
+        if options['output'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+            for name, result in views.items():
+                self.stdout.write(
+                    f'{name:32} {result["median_ms"]:9.1f} ms '
+                    f'{result["queries"]:5} / {result["budget"]} queries'
+                )
+
+        exceeded = [
+            name for name, result in views.items()
+            if result['budget'] is not None
+            and result['queries'] > result['budget']
+        ]
+        if options['check'] and exceeded:
+            raise CommandError(
+                'Превышен бюджет SQL-запросов: ' + ', '.join(exceeded))
+
+    def get_user(self, username):
+        users = User.objects.filter(is_active=True)
+        if username:
+            users = users.filter(username=username)
+        user = (
+            users
+            .annotate(count=Count('progression'))
+            .order_by('-count')
+            .first()
+        )
+        if user is None:
+            raise CommandError('Пользователь не найден')
+        return user
+
+    def get_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def get_answer(self, exam, stage):
+        question = get_exam_snapshot(exam).questions[stage - 1]
+        if question.one_correct:
+            return {'result': question.variants[0].id}
+        if question.many_correct:
+            return {str(variant_id): 'on' for variant_id
+                    in question.correct_ids}
+        return {'answer': next(iter(question.correct_texts), 'answer')}
+
+    def measure(self, method, requests):
+        timings, sql_timings, counts = [], [], []
+
+        for url, data in requests:
+            with CaptureQueriesContext(connection) as queries:
+                start = perf_counter()
+                response = getattr(self.client, method)(url, data)
+                timings.append((perf_counter() - start) * 1000)
+            counts.append(len(queries))
+            sql_timings.append(sum(
+                float(query['time']) for query in queries) * 1000)
+        budget = get_view_budget(resolve(url.split('?')[0]).func)
+
+        return {
+            'status': response.status_code,
+            'queries': max(counts),
+            'budget': budget and budget.queries,
+            'min_ms': round(min(timings), 2),
+            'median_ms': round(median(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'sql_median_ms': round(median(sql_timings), 2)
+        }
+
+    def get_cases(self, user, exam):
+        progress = (
+            Progress.objects
+            .filter(user=user, finished__isnull=False)
+            .order_by('-finished')
+            .first()
+        )
+        cases = [
+            ('index', 'get', reverse('exams:index')),
+            ('exam_list', 'get', reverse('exams:exam_list')),
+            ('exam_detail', 'get', exam.get_absolute_url()),
+            ('profile', 'get', user.get_absolute_url()),
+            ('rankings', 'get', reverse('users:users_rankings')),
+            ('progress_list', 'get', reverse(
+                'progress:progress_list',
+                kwargs={'username': user.username})),
+            ('api_exams', 'get', reverse('api:exams-list')),
+        ]
+        if progress:
+            cases.append(('progress_detail', 'get', reverse(
+                'progress:progress_detail', kwargs={'pk': progress.id})))
+        return cases
+
+    def run_cases(self, user, exam):
+        results = {}
+
+        for name, method, url in self.get_cases(user, exam):
+            results[f'anonymous:{name}'] = self.measure(
+                method, [(url, None)] * self.repeat)
+
+        self.client.force_login(user)
+        for name, method, url in self.get_cases(user, exam):
+            results[name] = self.measure(method, [(url, None)] * self.repeat)
+
+        Progress.objects.filter(user=user, exam=exam).delete()
+        stages = range(1, min(self.repeat, exam.count) + 1)
+        results['exam_process:get'] = self.measure('get', [
+            (self.get_stage_url(exam, 1), None)] * self.repeat)
+        results['exam_process:post'] = self.measure('post', [
+            (self.get_stage_url(exam, stage), self.get_answer(exam, stage))
+            for stage in stages
+        ])
+        return results
+
+    def get_stage_url(self, exam, stage):
+        return reverse(
+            'exams:exam_process', kwargs={'slug': exam.slug, 'pk': stage})
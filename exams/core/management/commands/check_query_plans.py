@@ -0,0 +1,155 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+
+from exams.models import Exam, Question, Variant
+from progress.models import (ArchivedProgress, LatestProgress, Progress,
+                             UserAnswer)
+from users.models import Ranking, User
+
+CHECKED_MODELS = (
+    Exam, Question, Variant, Progress, LatestProgress, ArchivedProgress,
+    UserAnswer, Ranking
+)
+CHECKED_TABLES = {model._meta.db_table for model in CHECKED_MODELS}
+FULL_INDEX_SCANS = ('Index Scan', 'Index Only Scan')
+
+
+class Command(BaseCommand):
+    help = ('Строит планы EXPLAIN основных запросов при текущих настройках '
+            'планировщика и завершается с ошибкой, если по крупным таблицам '
+            'тестов и прогресса остались полные сканирования')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?',
+            help='Путь к JSON-файлу для сохранения планов')
+        parser.add_argument(
+            '--min-rows', type=int, default=5000,
+            help=('Полные обходы допускаются для таблиц, в которых '
+                  'меньше строк'))
+        parser.add_argument(
+            '--user', help='Имя пользователя, для которого строятся запросы')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError(
+                'Проверка планов поддерживается только для PostgreSQL')
+
+        user, exam, progress = self.get_sample(options['user'])
+        large = self.get_large_tables(options['min_rows'])
+        plans = {}
+        failed = []
+
+        for name, queryset in self.get_cases(user, exam, progress):
+            plan = self.explain(queryset)
+            plans[name] = plan
+            scans = sorted({
+                node['Relation Name'] for node in self.walk(plan[0]['Plan'])
+                if self.is_full_scan(node, large)
+            })
+            if scans:
+                failed.append(f'{name} ({", ".join(scans)})')
+            self.stdout.write(f'{name:32} {"seq scan" if scans else "ok"}')
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(plans, file, indent=2)
+
+        if failed:
+            raise CommandError(
+                'Последовательное сканирование: ' + ', '.join(failed))
+
+    def get_sample(self, username):
+        users = User.objects.filter(is_active=True)
+        if username:
+            users = users.filter(username=username)
+        user = (
+            users
+            .annotate(count=Count('progression'))
+            .order_by('-count')
+            .first()
+        )
+        if user is None:
+            raise CommandError('Пользователь не найден')
+
+        progress = (
+            Progress.objects
+            .filter(user=user, finished__isnull=False)
+            .select_related('exam')
+            .order_by('-finished')
+            .first()
+        )
+        if progress is None:
+            raise CommandError('У пользователя нет завершенных попыток')
+        return user, progress.exam, progress
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        prefix = connection.ops.explain_query_prefix(format='json')
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan
+
+    def get_large_tables(self, min_rows):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT relname FROM pg_class '
+                'WHERE relname = ANY(%s) AND reltuples >= %s',
+                [sorted(CHECKED_TABLES), min_rows]
+            )
+            return {row[0] for row in cursor.fetchall()}
+
+    def is_full_scan(self, node, large):
+        if node.get('Relation Name') not in large:
+            return False
+        if node['Node Type'] == 'Seq Scan':
+            return True
+        return (
+            node['Node Type'] in FULL_INDEX_SCANS
+            and 'Index Cond' not in node
+        )
+
+    def walk(self, node):
+        yield node
+        for child in node.get('Plans', ()):
+            yield from self.walk(child)
+
+    def get_cases(self, user, exam, progress):
+        question = exam.questions.filter(active=True, visibility=True).first()
+        cases = [
+            ('exam_list', Exam.objects.list_()[:18]),
+            ('exam_list_user', Exam.objects.list_(user=user)[:18]),
+            ('exam_list_only_user', Exam.objects.list_(
+                user=user, only_user=True).order_by('-started')[:6]),
+            ('exam_questions', exam.questions.filter(
+                active=True, visibility=True).order_by('priority', 'id')),
+            ('exam_variants', Variant.objects.filter(
+                question__exam=exam).order_by('question', 'priority', 'id')),
+            ('latest_progress', Progress.objects.filter(
+                user=user, exam__slug=exam.slug, latest__isnull=False)),
+            ('finished_before', Progress.objects.filter(
+                user=user, exam=exam, finished__isnull=False
+            ).exclude(id=progress.id)),
+            ('progress_answers', UserAnswer.objects.filter(
+                progress=progress).get_counters().order_by('date')),
+            ('progress_stage_answer', UserAnswer.objects.filter(
+                progress=progress, question=question
+            ).order_by('date')),
+            ('progress_detail', Progress.objects.get_details().filter(
+                id=progress.id)),
+            ('archived_progress', ArchivedProgress.objects.filter(
+                user=user, exam=exam)),
+            ('user_profile', User.objects.filter(
+                username=user.username).with_ranking()),
+            ('rankings', User.objects.filter(is_active=True).with_ranking()
+             .filter(ranking__isnull=False)
+             .order_by(*Ranking.objects.ordering)[:50]),
+        ]
+        return cases
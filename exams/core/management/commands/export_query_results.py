@@ -0,0 +1,96 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from exams.models import Category, Exam, ExamStats, QuestionStats
+from progress.models import Progress
+from users.models import Ranking, User
+
+
+class Command(BaseCommand):
+    help = ('Выгружает результаты основных запросов статистики в JSON, '
+            'чтобы сравнить их на разных СУБД с одинаковыми данными')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Путь к JSON-файлу, по умолчанию стандартный вывод')
+        parser.add_argument(
+            '--compare',
+            help='JSON-файл, выгруженный с другой СУБД, для сравнения')
+        parser.add_argument(
+            '--users', type=int, default=50,
+            help='Количество пользователей для персональных выборок')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            results = json.loads(json.dumps(
+                self.get_results(options['users']), cls=DjangoJSONEncoder))
+            transaction.set_rollback(True)
+
+        if options['output'] == '-':
+            self.stdout.write(json.dumps(results, indent=2))
+        else:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+
+        if options['compare']:
+            with open(options['compare'], encoding='utf-8') as file:
+                other = json.load(file)
+            different = sorted(
+                name for name in results.keys() | other.keys()
+                if results.get(name) != other.get(name)
+            )
+            if different:
+                raise CommandError(
+                    'Результаты расходятся: ' + ', '.join(different))
+            self.stdout.write(self.style.SUCCESS(
+                f'Результаты совпадают ({connection.vendor})'))
+
+    def get_results(self, users_count):
+        results = {
+            'categories': Category.objects.exams_count().values(
+                'id', 'exams_count'),
+            'exams': Exam.objects.list_().values(
+                'id', 'questions_count', 'users_count', 'average_progress'),
+            'users': User.objects.with_progress().values(
+                'id', 'exams_count', 'passed_count', 'correct_percentage',
+                'points'),
+            'progress': Progress.objects.get_details().get_percentage().values(
+                'id', 'questions_count', 'correct_count',
+                'correct_percentage'),
+        }
+        for user in User.objects.order_by('id')[:users_count]:
+            results[f'exams:{user.id}'] = Exam.objects.list_(user=user).values(
+                'id', 'progress_id', 'current_answers', 'current_stage',
+                'started', 'finished', 'passed', 'percentage_answers',
+                'percentage_correct')
+
+        ExamStats.objects.rebuild()
+        QuestionStats.objects.rebuild()
+        Ranking.objects.refresh()
+        results.update({
+            'exam_stats': ExamStats.objects.values(),
+            'question_stats': QuestionStats.objects.values(),
+            'rankings': [
+                {
+                    'id': user.id,
+                    'rank': user.rank,
+                    **{
+                        field: getattr(user, field)
+                        for field in Ranking.objects.stats_fields
+                    }
+                }
+                for user in Ranking.objects.set_ranks(list(
+                    User.objects.with_ranking()
+                    .filter(ranking__isnull=False)
+                    .order_by(*Ranking.objects.ordering)
+                ))
+            ],
+        })
+        return {
+            name: sorted(queryset, key=lambda row: next(iter(row.values())))
+            for name, queryset in results.items()
+        }
@@ -0,0 +1,268 @@
+from datetime import timedelta
+from random import Random
+from uuid import uuid4
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from core.bulk import bulk_create
+from exams.exchange import Importer
+from exams.models import Exam, ExamStats, Question, QuestionStats, Variant
+from progress.models import LatestProgress, Progress, UserAnswer
+from users.models import Ranking, User
+
+
+class Command(BaseCommand):
+    help = ('Создает синтетические данные: пользователей, категории, тесты, '
+            'вопросы, варианты ответов и попытки прохождения')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=5)
+        parser.add_argument(
+            '--exams', type=int, default=10, help='Тестов в категории')
+        parser.add_argument(
+            '--questions', type=int, default=20, help='Вопросов в тесте')
+        parser.add_argument(
+            '--variants', type=int, default=4, help='Вариантов в вопросе')
+        parser.add_argument(
+            '--attempts', type=int, default=5,
+            help='Попыток прохождения на пользователя')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        self.random = Random(options['seed'])
+        self.batch_size = options['batch_size']
+        self.tag = uuid4().hex[:6]
+
+        with transaction.atomic():
+            user_ids = self.create_users(options['users'])
+            exam_ids = self.create_exams(options)
+            attempts, answers = self.create_attempts(
+                user_ids, exam_ids, options['attempts'])
+
+        ExamStats.objects.rebuild()
+        QuestionStats.objects.rebuild()
+        Ranking.objects.refresh()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано пользователей: {len(user_ids)}, '
+            f'тестов: {len(exam_ids)}, попыток: {attempts}, '
+            f'ответов: {answers}'
+        ))
+
+    def create_users(self, count):
+        password = make_password('password')
+        now = timezone.now()
+        users = [
+            User(
+                username=f'{self.tag}-user-{number}',
+                email=f'{self.tag}-user-{number}@example.com',
+                password=password,
+                date_joined=now - timedelta(
+                    days=self.random.randint(0, 365))
+            )
+            for number in range(count)
+        ]
+        bulk_create(User, users, batch_size=self.batch_size)
+        return [user.id for user in users]
+
+    def get_exam_records(self, options):
+        exams_count = options['categories'] * options['exams']
+        types = [
+            self.random.choice([choice for choice, _ in Question.TYPES])
+            for _ in range(exams_count * options['questions'])
+        ]
+
+        for category in range(options['categories']):
+            yield {
+                'model': 'category',
+                'id': category,
+                'title': f'Category {self.tag} {category}',
+                'description': 'Generated category'
+            }
+        for exam in range(exams_count):
+            yield {
+                'model': 'exam',
+                'id': exam,
+                'category': exam % options['categories'],
+                'title': f'Exam {self.tag} {exam}',
+                'description': 'Generated exam',
+                'required_percent': self.random.choice((None, 50, 80)),
+                'visibility': True
+            }
+        for question, question_type in enumerate(types):
+            number = question % options['questions']
+            yield {
+                'model': 'question',
+                'id': question,
+                'exam': question // options['questions'],
+                'type': question_type,
+                'text': f'Question {number}',
+                'priority': number % 99 + 1,
+                'visibility': True
+            }
+        for question, question_type in enumerate(types):
+            yield from self.get_variant_records(
+                question, question_type, options['variants'])
+
+    def get_variant_records(self, question, question_type, count):
+        correct = {0}
+        if question_type == Question.MANY_CORRECT:
+            correct.update(self.random.sample(range(count), count // 2))
+
+        for variant in range(count):
+            yield {
+                'model': 'variant',
+                'question': question,
+                'text': f'Variant {variant}',
+                'correct': variant in correct
+            }
+
+    def create_exams(self, options):
+        importer = Importer(self.batch_size)
+        for record in self.get_exam_records(options):
+            importer.add(record)
+        importer.finish()
+        return list(importer.ids['exam'].values())
+
+    def get_exams(self, exam_ids):
+        exams = {
+            exam['id']: dict(exam, questions=[])
+            for exam in Exam.objects.filter(id__in=exam_ids)
+            .values('id', 'revision', 'required_percent')
+        }
+        questions = {}
+
+        for question in (
+            Question.objects
+            .filter(exam_id__in=exam_ids, active=True, visibility=True)
+            .order_by('priority', 'id')
+            .values('id', 'exam_id', 'type')
+        ):
+            question['variants'] = []
+            questions[question['id']] = question
+            exams[question['exam_id']]['questions'].append(question)
+
+        for variant in (
+            Variant.objects
+            .filter(question_id__in=questions)
+            .order_by('priority', 'id')
+            .values('id', 'question_id', 'correct')
+        ):
+            questions[variant['question_id']]['variants'].append(variant)
+        return [exam for exam in exams.values() if exam['questions']]
+
+    def answer_question(self, question, correct):
+        variants = question['variants']
+        if correct:
+            selected = {
+                variant['id'] for variant in variants if variant['correct']}
+        else:
+            wrong = [
+                variant['id'] for variant in variants
+                if not variant['correct']
+            ]
+            selected = set(self.random.sample(wrong, min(1, len(wrong))))
+
+        text = None
+        if question['type'] == Question.TEXT_ANSWER and not correct:
+            text = 'Wrong answer'
+        return {
+            'selected_ids': sorted(selected),
+            'correct_ids': [
+                variant['id'] for variant in variants if variant['correct']],
+            'text': text
+        }
+
+    def build_attempt(self, user_id, exam, skill, offset, latest):
+        questions = exam['questions']
+        finished = not latest or self.random.random() < 0.9
+        count = len(questions)
+        if not finished:
+            count = self.random.randint(0, count - 1)
+
+        results = [
+            (question, self.random.random() < skill)
+            for question in questions[:count]
+        ]
+        started = timezone.now() - timedelta(minutes=offset)
+        progress = Progress(
+            user_id=user_id,
+            exam_id=exam['id'],
+            exam_revision=exam['revision'],
+            stage=count + 1,
+            answers_quantity=count,
+            started=started
+        )
+
+        if finished:
+            percent = sum(result for _, result in results) * 100 / count
+            progress.finished = started + timedelta(
+                minutes=self.random.randint(1, 60))
+            progress.passed = (
+                not exam['required_percent']
+                or percent >= exam['required_percent']
+            )
+        return progress, results
+
+    def create_attempts(self, user_ids, exam_ids, attempts_count):
+        exams = self.get_exams(exam_ids)
+        attempts = []
+        answers_count = 0
+
+        if not exams:
+            return 0, 0
+
+        for user_id in user_ids:
+            skill = self.random.uniform(0.3, 0.95)
+            chosen = [self.random.choice(exams) for _ in range(attempts_count)]
+            offsets = sorted(
+                (self.random.randint(60, 60 * 24 * 365) for _ in chosen),
+                reverse=True
+            )
+            for index, (exam, offset) in enumerate(zip(chosen, offsets)):
+                latest = all(
+                    other['id'] != exam['id'] for other in chosen[index + 1:])
+                attempts.append(self.build_attempt(
+                    user_id, exam, skill, offset, latest))
+            if len(attempts) >= self.batch_size:
+                answers_count += self.save_attempts(attempts)
+                attempts = []
+
+        answers_count += self.save_attempts(attempts)
+        return len(user_ids) * attempts_count, answers_count
+
+    def save_attempts(self, attempts):
+        bulk_create(
+            Progress, [progress for progress, _ in attempts],
+            batch_size=self.batch_size
+        )
+        latest = {
+            (progress.user_id, progress.exam_id): progress.id
+            for progress, _ in attempts
+        }
+        LatestProgress.objects.bulk_create(
+            [
+                LatestProgress(
+                    user_id=user_id, exam_id=exam_id, progress_id=progress_id)
+                for (user_id, exam_id), progress_id in latest.items()
+            ],
+            batch_size=self.batch_size
+        )
+        answers = [
+            UserAnswer(
+                progress_id=progress.id,
+                question_id=question['id'],
+                correct=correct,
+                no_answers=False,
+                **self.answer_question(question, correct)
+            )
+            for progress, results in attempts
+            for question, correct in results
+        ]
+        UserAnswer.objects.bulk_create(answers, batch_size=self.batch_size)
+        return len(answers)
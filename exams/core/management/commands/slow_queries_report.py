@@ -0,0 +1,73 @@
+import glob
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ('Сводка медленных SQL-запросов из журнала: отпечатки '
+            'запросов, отсортированные по суммарному времени')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=10)
+        parser.add_argument(
+            '--plans', action='store_true',
+            help='Выводить план самого долгого выполнения запроса')
+        parser.add_argument(
+            '--log', default=settings.SLOW_QUERY_LOG_FILE,
+            help='Путь к журналу, ротированные файлы читаются тоже')
+
+    def read_entries(self, path):
+        for filename in sorted(glob.glob(glob.escape(path) + '*')):
+            with open(filename, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+
+    def collect(self, path):
+        summary = {}
+
+        for entry in self.read_entries(path):
+            item = summary.setdefault(entry['fingerprint'], {
+                'sql': entry['sql'],
+                'count': 0,
+                'total_ms': 0,
+                'max_ms': 0,
+                'views': set(),
+                'plan': None
+            })
+            item['count'] += 1
+            item['total_ms'] += entry['duration_ms']
+            item['views'].add(entry['view'] or '-')
+            if entry['duration_ms'] >= item['max_ms']:
+                item['max_ms'] = entry['duration_ms']
+                item['plan'] = entry['plan'] or item['plan']
+        return summary
+
+    def handle(self, *args, **options):
+        summary = self.collect(options['log'])
+        top = sorted(
+            summary.items(), key=lambda item: item[1]['total_ms'],
+            reverse=True
+        )[:options['top']]
+
+        if not top:
+            self.stdout.write('Медленных запросов не найдено')
+            return
+
+        for key, item in top:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{key}  всего {item["total_ms"]:.0f} мс, '
+                f'вызовов {item["count"]}, '
+                f'среднее {item["total_ms"] / item["count"]:.1f} мс, '
+                f'максимум {item["max_ms"]:.1f} мс'
+            ))
+            views = ', '.join(sorted(item['views']))
+            self.stdout.write(f'  Представления: {views}')
+            self.stdout.write(f'  {item["sql"][:500]}')
+            if options['plans'] and item['plan']:
+                self.stdout.write(item['plan'])
+            self.stdout.write('')
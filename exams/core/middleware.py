@@ -0,0 +1,101 @@
+from random import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from .budgets import QueryBudgetError, get_view_budget, logger, record_queries
+from .profiling import get_current_profile, profile_request
+from .routers import STICKY_COOKIE, WriteRecorder, is_read_only, set_replicas
+from .slow_queries import log_slow_queries
+
+
+class QueryBudgetMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        budget = getattr(request, 'query_budget', None)
+        if budget is None:
+            return response
+
+        errors = budget.check(recorder, request.resolver_match.view_name)
+        if errors and settings.QUERY_BUDGET_RAISE:
+            raise QueryBudgetError('; '.join(errors))
+        for error in errors:
+            logger.warning(error)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request.query_budget = get_view_budget(view_func)
+
+
+class ProfilingMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        with profile_request(request) as profile:
+            response = self.get_response(request)
+            profile.status = response.status_code
+        return response
+
+    def process_template_response(self, request, response):
+        profile = get_current_profile()
+        if profile is None:
+            return response
+        render = response.render
+
+        def timed_render():
+            with profile.timer('template_ms'):
+                return render()
+
+        response.render = timed_render
+        return response
+
+
+class SlowQueryMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with log_slow_queries(request):
+            return self.get_response(request)
+
+
+class ReplicaMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = WriteRecorder()
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(recorder):
+                response = self.get_response(request)
+        finally:
+            set_replicas(False)
+
+        if recorder.written:
+            response.set_cookie(
+                STICKY_COOKIE, '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        set_replicas(
+            request.method in ('GET', 'HEAD')
+            and STICKY_COOKIE not in request.COOKIES
+            and is_read_only(view_func)
+        )
@@ -0,0 +1,86 @@
+from django.contrib.postgres import operations
+from django.db.migrations import AddIndex, AlterField
+from django.db.models import Index
+
+
+def is_postgres(schema_editor: object) -> bool:
+    return schema_editor.connection.vendor == 'postgresql'
+
+
+def get_field_indexes(schema_editor: object, model: object,
+                      field: object) -> list:
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, model._meta.db_table)
+    return [
+        name for name, constraint in constraints.items()
+        if constraint['index']
+        and not constraint['unique']
+        and not constraint['primary_key']
+        and constraint['columns'] == [field.column]
+    ]
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if is_postgres(schema_editor):
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(
+                self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if is_postgres(schema_editor):
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(
+                self, app_label, schema_editor, from_state, to_state)
+
+
+class AlterFieldIndexConcurrently(operations.NotInTransactionMixin,
+                                  AlterField):
+    atomic = False
+
+    def describe(self):
+        return (f'Concurrently alter index of field {self.name} '
+                f'on {self.model_name}')
+
+    def alter_index(self, app_label, schema_editor, from_state, to_state):
+        self._ensure_not_in_transaction(schema_editor)
+        from_model = from_state.apps.get_model(app_label, self.model_name)
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        if not self.allow_migrate_model(
+            schema_editor.connection.alias, to_model
+        ):
+            return
+
+        old_field = from_model._meta.get_field(self.name)
+        new_field = to_model._meta.get_field(self.name)
+        if old_field.db_index and not new_field.db_index:
+            for name in get_field_indexes(
+                schema_editor, from_model, old_field
+            ):
+                schema_editor.execute(
+                    'DROP INDEX CONCURRENTLY IF EXISTS '
+                    + schema_editor.quote_name(name)
+                )
+        elif new_field.db_index and not old_field.db_index:
+            index = Index(
+                fields=[new_field.name],
+                name=f'{to_model._meta.db_table}_{new_field.column}_idx'
+            )
+            schema_editor.add_index(to_model, index, concurrently=True)
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if is_postgres(schema_editor):
+            self.alter_index(app_label, schema_editor, from_state, to_state)
+        else:
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state)
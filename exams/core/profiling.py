@@ -0,0 +1,111 @@
+import json
+import logging
+from contextlib import contextmanager
+from threading import Lock, local
+from time import perf_counter
+
+from .budgets import record_queries
+
+logger = logging.getLogger('core.profiling')
+
+METRICS = (
+    'wall_ms', 'queries', 'db_ms', 'cache_hits', 'cache_misses', 'template_ms'
+)
+
+_current = local()
+
+
+class RequestProfile:
+
+    def __init__(self):
+        self.view = None
+        self.method = None
+        self.status = None
+        self.values = dict.fromkeys(METRICS, 0)
+
+    def add(self, metric: str, value: float) -> None:
+        self.values[metric] += value
+
+    @contextmanager
+    def timer(self, metric: str) -> object:
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(metric, (perf_counter() - start) * 1000)
+
+    def as_dict(self) -> dict:
+        values = {
+            metric: round(value, 2) for metric, value in self.values.items()
+        }
+        return dict(
+            view=self.view, method=self.method, status=self.status, **values)
+
+
+class ProfileStats:
+
+    def __init__(self):
+        self.lock = Lock()
+        self.views = {}
+
+    def add(self, profile: RequestProfile) -> None:
+        with self.lock:
+            entry = self.views.setdefault(profile.view, {
+                'requests': 0,
+                'total': dict.fromkeys(METRICS, 0),
+                'max': dict.fromkeys(METRICS, 0)
+            })
+            entry['requests'] += 1
+            for metric, value in profile.values.items():
+                entry['total'][metric] += value
+                entry['max'][metric] = max(entry['max'][metric], value)
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            views = {}
+            for view, entry in self.views.items():
+                views[view] = {'requests': entry['requests']}
+                for metric in METRICS:
+                    views[view][f'avg_{metric}'] = round(
+                        entry['total'][metric] / entry['requests'], 2)
+                    views[view][f'max_{metric}'] = round(
+                        entry['max'][metric], 2)
+            return views
+
+    def reset(self) -> None:
+        with self.lock:
+            self.views = {}
+
+
+stats = ProfileStats()
+
+
+def get_current_profile() -> RequestProfile:
+    return getattr(_current, 'profile', None)
+
+
+def record_cache(hits: int, misses: int) -> None:
+    profile = get_current_profile()
+    if profile is not None:
+        profile.add('cache_hits', hits)
+        profile.add('cache_misses', misses)
+
+
+@contextmanager
+def profile_request(request: object) -> object:
+    profile = RequestProfile()
+    profile.method = request.method
+    _current.profile = profile
+
+    try:
+        with profile.timer('wall_ms'), record_queries() as recorder:
+            yield profile
+    finally:
+        _current.profile = None
+        profile.add('queries', recorder.count)
+        profile.add('db_ms', recorder.time_ms)
+        match = request.resolver_match
+        profile.view = match.view_name if match else None
+
+    stats.add(profile)
+    logger.info(json.dumps(profile.as_dict()))
@@ -0,0 +1,77 @@
+from random import choice
+from threading import local
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE')
+
+STICKY_COOKIE = 'use_primary'
+
+_current = local()
+
+
+def read_only(view: object) -> object:
+    view.read_only = True
+    return view
+
+
+def is_read_only(view_func: object) -> bool:
+    view_class = (
+        getattr(view_func, 'view_class', None)
+        or getattr(view_func, 'cls', None)
+    )
+    return bool(
+        getattr(view_func, 'read_only', False)
+        or getattr(view_class, 'read_only', False)
+    )
+
+
+def set_replicas(enabled: bool) -> None:
+    _current.use_replicas = enabled
+
+
+def get_instance_db(hints: dict) -> str:
+    state = getattr(hints.get('instance'), '_state', None)
+    database = getattr(state, 'db', None)
+    if database in (DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS):
+        return None
+    return database
+
+
+class WriteRecorder:
+
+    def __init__(self):
+        self.written = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if sql.lstrip()[:6].upper() in WRITE_STATEMENTS:
+            self.written = True
+        return execute(sql, params, many, context)
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        database = get_instance_db(hints)
+        if database:
+            return database
+        if (
+            not getattr(_current, 'use_replicas', False)
+            or not settings.DATABASE_REPLICAS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return get_instance_db(hints) or DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+import re
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+
+logger = logging.getLogger('core.slow_queries')
+
+NORMALIZE = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+)
+
+
+def normalize(sql: str) -> str:
+    for pattern, replacement in NORMALIZE:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.md5(normalize(sql).encode()).hexdigest()[:12]
+
+
+def explain(connection: object, sql: str, params: object) -> str:
+    if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+        return None
+    wrappers, connection.execute_wrappers = connection.execute_wrappers, []
+
+    try:
+        prefix = connection.ops.explain_query_prefix(
+            analyze=settings.SLOW_QUERY_EXPLAIN_ANALYZE)
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                return '\n'.join(str(row[-1]) for row in cursor.fetchall())
+    except (DatabaseError, ValueError):
+        return None
+    finally:
+        connection.execute_wrappers = wrappers
+
+
+class SlowQueryLogger:
+
+    def __init__(self, connection: object, request: object = None):
+        self.connection = connection
+        self.request = request
+
+    def get_view_name(self) -> str:
+        match = getattr(self.request, 'resolver_match', None)
+        return match.view_name if match else None
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (perf_counter() - start) * 1000
+
+        if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+            self.log(sql, params, many, duration)
+        return result
+
+    def log(self, sql, params, many, duration) -> None:
+        logger.warning(json.dumps({
+            'fingerprint': fingerprint(sql),
+            'sql': normalize(sql),
+            'duration_ms': round(duration, 2),
+            'view': self.get_view_name(),
+            'database': self.connection.alias,
+            'plan': None if many else explain(self.connection, sql, params)
+        }, ensure_ascii=False))
+
+
+@contextmanager
+def log_slow_queries(request: object = None) -> object:
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(
+                SlowQueryLogger(connection, request)))
+        yield
@@ -0,0 +1,116 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from core.budgets import assert_query_budget
+from exams.activation import recompute_activation
+from exams.models import Category, Exam, Question, Variant
+from progress.models import Progress
+from users.models import User
+
+TEST_CACHES = {
+    'default': {
+        'BACKEND': 'core.cache.TieredCache',
+        'LOCATION': 'tests',
+        'OPTIONS': {'SHARED_CACHE': 'shared'}
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'tests'
+    }
+}
+
+
+@override_settings(CACHES=TEST_CACHES)
+class QueryBudgetTest(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email='alice@example.com', username='alice', password='password')
+        category = Category.objects.create(title='Категория')
+
+        for number in range(3):
+            exam = Exam.objects.create(
+                title=f'Тест {number}', category=category, author=self.user,
+                visibility=True, timer=30, required_percent=50,
+                empty_answers=number == 1
+            )
+            for priority, question_type in enumerate(
+                (choice for choice, _ in Question.TYPES), start=1
+            ):
+                question = Question.objects.create(
+                    exam=exam, text=f'Вопрос {priority}', type=question_type,
+                    visibility=True, priority=priority
+                )
+                for variant in range(3):
+                    Variant.objects.create(
+                        question=question, text=f'Вариант {variant}',
+                        correct=variant == 0
+                    )
+        recompute_activation(set(Exam.objects.values_list('id', flat=True)))
+        self.exam = Exam.objects.get(title='Тест 0')
+        self.questions = list(self.exam.questions.order_by('priority'))
+        self.client.force_login(self.user)
+
+    def get_answer(self, question):
+        variant = question.variants.order_by('id').first()
+        if question.type == Question.ONE_CORRECT:
+            return {'result': variant.id}
+        if question.type == Question.MANY_CORRECT:
+            return {str(variant.id): 'on'}
+        return {'answer': variant.text}
+
+    def pass_exam(self):
+        for stage, question in enumerate(self.questions, start=1):
+            url = reverse('exams:exam_process', args=(self.exam.slug, stage))
+            response = assert_query_budget(self.client, url)
+            self.assertEqual(response.status_code, 200)
+            response = assert_query_budget(
+                self.client, url, 'post', self.get_answer(question))
+            self.assertEqual(response.status_code, 302)
+        return Progress.objects.get(user=self.user, exam=self.exam)
+
+    def test_index(self):
+        self.client.logout()
+        for _ in range(2):
+            response = assert_query_budget(self.client, reverse('exams:index'))
+            self.assertEqual(response.status_code, 200)
+
+        self.client.force_login(self.user)
+        response = assert_query_budget(self.client, reverse('exams:index'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_exam_detail(self):
+        url = reverse('exams:exam_detail', args=(self.exam.slug,))
+        response = assert_query_budget(self.client, url)
+        self.assertEqual(response.status_code, 200)
+
+        self.pass_exam()
+        response = assert_query_budget(self.client, url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_exam_process(self):
+        progress = self.pass_exam()
+        self.assertIsNotNone(progress.finished)
+
+        url = reverse('exams:exam_process', args=(self.exam.slug, 1))
+        response = assert_query_budget(self.client, url)
+        self.assertEqual(response.status_code, 200)
+
+        response = assert_query_budget(self.client, url + '?restart=1')
+        self.assertEqual(response.status_code, 200)
+
+    def test_progress_detail(self):
+        progress = self.pass_exam()
+        url = reverse('progress:progress_detail', args=(progress.id,))
+
+        response = assert_query_budget(self.client, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['result']['answers'])
+
+        Progress.objects.filter(id=progress.id).update(result=None)
+        cache.clear()
+        response = assert_query_budget(self.client, url)
+        self.assertEqual(response.status_code, 200)
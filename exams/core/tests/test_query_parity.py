@@ -0,0 +1,74 @@
+import json
+from io import StringIO
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import TransactionTestCase, override_settings
+
+from core.management.commands.export_query_results import Command
+from exams.models import (Category, Exam, ExamStats, Question, QuestionStats,
+                          Variant)
+from progress.models import LatestProgress, Progress, UserAnswer
+from users.models import Ranking, User
+
+ALIASES = {
+    connections[alias].vendor: alias for alias in reversed(settings.DATABASES)
+    if alias not in settings.DATABASE_REPLICAS
+}
+POSTGRES = ALIASES.get('postgresql')
+SQLITE = ALIASES.get('sqlite')
+
+COPIED_MODELS = (
+    User, Category, Exam, Question, Variant, Progress, LatestProgress,
+    UserAnswer, ExamStats, QuestionStats, Ranking
+)
+USERS_COUNT = 30
+
+
+class AliasRouter:
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    def db_for_read(self, model, **hints):
+        return self.alias
+
+    def db_for_write(self, model, **hints):
+        return self.alias
+
+
+@skipUnless(
+    POSTGRES and SQLITE and DEFAULT_DB_ALIAS in (POSTGRES, SQLITE),
+    'Нужны подключения к PostgreSQL и SQLite, одно из них по умолчанию'
+)
+class QueryParityTest(TransactionTestCase):
+    databases = {alias for alias in (POSTGRES, SQLITE) if alias}
+
+    def setUp(self):
+        call_command(
+            'generate_data', users=USERS_COUNT, categories=2, exams=3,
+            questions=8, attempts=3, seed=1, stdout=StringIO()
+        )
+        target = SQLITE if DEFAULT_DB_ALIAS == POSTGRES else POSTGRES
+
+        for model in COPIED_MODELS:
+            model._base_manager.using(target).bulk_create(
+                model._base_manager.using(DEFAULT_DB_ALIAS).order_by('pk'))
+
+    def get_results(self, alias):
+        with override_settings(DATABASE_ROUTERS=[AliasRouter(alias)]):
+            results = Command().get_results(USERS_COUNT)
+        return json.loads(json.dumps(results, cls=DjangoJSONEncoder))
+
+    def test_results_match(self):
+        postgres = self.get_results(POSTGRES)
+        sqlite = self.get_results(SQLITE)
+
+        self.assertEqual(postgres.keys(), sqlite.keys())
+        self.assertTrue(postgres['progress'])
+        for name in postgres:
+            with self.subTest(name=name):
+                self.assertEqual(postgres[name], sqlite[name])
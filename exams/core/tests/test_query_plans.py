@@ -0,0 +1,35 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+
+@skipUnless(
+    connection.vendor == 'postgresql',
+    'Планы запросов проверяются только на PostgreSQL'
+)
+class QueryPlanTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            'generate_data', users=500, categories=2, exams=5, questions=20,
+            attempts=10, seed=1, stdout=StringIO()
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_planner_settings_are_default(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT name FROM pg_settings "
+                "WHERE name LIKE 'enable_%%' AND setting <> boot_val"
+            )
+            self.assertEqual(cursor.fetchall(), [])
+
+    def test_indexes_are_used(self):
+        output = StringIO()
+        call_command('check_query_plans', min_rows=2000, stdout=output)
+        self.assertNotIn('seq scan', output.getvalue())
@@ -0,0 +1,72 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.routers import STICKY_COOKIE
+from users.models import User
+
+REPLICA = next(iter(settings.DATABASE_REPLICAS), None)
+
+
+@skipUnless(REPLICA, 'Нужна реплика, задайте DB_REPLICA_HOSTS')
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'replicas'
+}})
+class ReplicaRoutingTest(TransactionTestCase):
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(
+            email='alice@example.com', username='alice', password='password')
+
+    def request(self, method, url, data=None):
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as primary:
+            with CaptureQueriesContext(connections[REPLICA]) as replica:
+                response = getattr(self.client, method)(url, data)
+        return response, len(primary), len(replica)
+
+    def test_read_only_get_uses_replica(self):
+        response, primary, replica = self.request(
+            'get', reverse('exams:index'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_post_uses_primary_and_sets_sticky_cookie(self):
+        response, primary, replica = self.request(
+            'post', reverse('users:login'),
+            {'username': 'alice@example.com', 'password': 'password'}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    def test_sticky_cookie_uses_primary(self):
+        self.client.cookies[STICKY_COOKIE] = '1'
+
+        response, primary, replica = self.request(
+            'get', reverse('exams:index'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_atomic_block_uses_primary(self):
+        with transaction.atomic():
+            response, primary, replica = self.request(
+                'get', reverse('exams:index'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
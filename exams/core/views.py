@@ -0,0 +1,76 @@
+import hashlib
+import hmac
+import os
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import Http404, JsonResponse
+
+from .cache import get_versions
+from .profiling import stats
+
+
+def make_etag(*parts) -> str:
+    return hashlib.md5(repr(parts).encode()).hexdigest()
+
+
+class AnonymousPageCacheMixin:
+    page_versions = ()
+
+    def get_page_versions(self) -> tuple:
+        return self.page_versions
+
+    def get_page_cache_key(self) -> str:
+        names = self.get_page_versions()
+        versions = get_versions(names)
+        path = hashlib.md5(self.request.get_full_path().encode()).hexdigest()
+        return ':'.join(
+            ('page', path, *(versions[name] for name in names)))
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = self.get_page_cache_key()
+        response = cache.get(key)
+        if response is not None:
+            return response
+
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+
+        def store(response):
+            cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+
+        if hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(store)
+        else:
+            store(response)
+        return response
+
+
+def has_metrics_access(request: object) -> bool:
+    if request.user.is_staff:
+        return True
+    token = request.META.get('HTTP_AUTHORIZATION', '')
+    return bool(settings.METRICS_TOKEN) and hmac.compare_digest(
+        token.encode(), f'Bearer {settings.METRICS_TOKEN}'.encode())
+
+
+def metrics(request):
+    if not has_metrics_access(request):
+        raise Http404
+    return JsonResponse({
+        'pid': os.getpid(),
+        'sample_rate': settings.PROFILING_SAMPLE_RATE,
+        'views': stats.snapshot(),
+        'cache': {
+            alias: caches[alias].stats()
+            for alias in settings.CACHES
+            if hasattr(caches[alias], 'stats')
+        }
+    })
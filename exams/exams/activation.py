@@ -0,0 +1,114 @@
+from functools import partial
+from threading import local
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Exam, Question
+from .pages import invalidate_catalog_pages
+from .snapshots import invalidate_exam_snapshot
+from .stats import invalidate_exam_counters
+
+_state = local()
+
+
+def is_question_active(question: dict, empty_answers: bool) -> bool:
+    if not question['variants_count']:
+        return False
+    if question['type'] == Question.ONE_CORRECT:
+        return question['correct_count'] == 1
+    if question['type'] == Question.MANY_CORRECT and empty_answers:
+        return True
+    return question['correct_count'] > 0
+
+
+def set_active(queryset: object, active_ids: set, ids: set) -> None:
+    queryset.filter(id__in=active_ids, active=False).update(active=True)
+    queryset.filter(
+        id__in=ids - active_ids, active=True).update(active=False)
+
+
+def recompute_activation(
+        exam_ids: set = frozenset(),
+        question_ids: set = frozenset(),
+        update_revision: bool = True
+) -> None:
+    questions = (
+        Question.objects
+        .filter(Q(id__in=question_ids) | Q(exam_id__in=exam_ids))
+        .order_by()
+        .values('id', 'type', 'exam_id', 'exam__empty_answers')
+        .annotate(
+            variants_count=Count('variants'),
+            correct_count=Count('variants', filter=Q(variants__correct=True))
+        )
+    )
+    active_ids = set()
+    ids = set()
+    exam_ids = set(exam_ids)
+
+    for question in questions:
+        ids.add(question['id'])
+        exam_ids.add(question['exam_id'])
+        if is_question_active(question, question['exam__empty_answers']):
+            active_ids.add(question['id'])
+
+    set_active(Question.objects, active_ids, ids)
+
+    active_exam_ids = set(
+        Question.objects
+        .filter(exam_id__in=exam_ids, active=True, visibility=True)
+        .values_list('exam_id', flat=True)
+        .distinct()
+    )
+    set_active(Exam.objects, active_exam_ids, exam_ids)
+
+    if update_revision:
+        (
+            Exam.objects
+            .filter(id__in=exam_ids, active=True, visibility=True)
+            .update(revision=timezone.now())
+        )
+
+    for exam_id in exam_ids:
+        invalidate_exam_snapshot(exam_id)
+    invalidate_exam_counters(exam_ids)
+    invalidate_catalog_pages()
+
+
+class RecomputeBatch:
+
+    def __init__(self):
+        self.exam_ids = set()
+        self.question_ids = set()
+
+    def add(self, exam_ids: tuple, question_ids: tuple) -> None:
+        self.exam_ids.update(exam_ids)
+        self.question_ids.update(question_ids)
+
+    def flush(self):
+        recompute_activation(self.exam_ids, self.question_ids)
+
+
+def get_batches() -> dict:
+    if not hasattr(_state, 'batches'):
+        _state.batches = {}
+    return _state.batches
+
+
+def flush_recompute(using: str) -> None:
+    batch = get_batches().pop(using, None)
+    if batch is not None:
+        batch.flush()
+
+
+def schedule_recompute(
+        exam_ids: tuple = (),
+        question_ids: tuple = (),
+        using: str = None
+) -> None:
+    using = transaction.get_connection(using).alias
+    batch = get_batches().setdefault(using, RecomputeBatch())
+    batch.add(exam_ids, question_ids)
+    transaction.on_commit(partial(flush_recompute, using), using=using)
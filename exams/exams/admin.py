@@ -2,11 +2,18 @@ from ckeditor.widgets import CKEditorWidget
 from django import forms
 from django.contrib import admin
 from django.db import models
+from django.db.models import Count, F, Q
 from django.forms import Textarea
 
 from .models import Category, Exam, Question, Variant
 
 
+def format_analysis(value: float) -> object:
+    if value is None:
+        return None
+    return round(value, 2)
+
+
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ('title', 'description', 'exams_count', 'priority')
     list_editable = ('priority',)
@@ -14,12 +21,17 @@ class CategoryAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.prefetch_related('exams')
+        return queryset.annotate(
+            exams_count=Count('exams', filter=Q(
+                exams__visibility=False, exams__active=False
+            ))
+        )
 
     def exams_count(self, obj):
-        return obj.exams.filter(visibility=False, active=False).count()
+        return obj.exams_count
 
     exams_count.short_description = 'Тестирований'
+    exams_count.admin_order_field = 'exams_count'
 
 
 class VariantInline(admin.TabularInline):
@@ -42,20 +54,21 @@ class QuestionInline(admin.StackedInline):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.prefetch_related('variants')
+        return queryset.annotate(variants_count=Count('variants'))
 
     def variants_count(self, obj):
-        return obj.variants.all().count()
+        return getattr(obj, 'variants_count', 0)
 
     variants_count.short_description = 'Вариантов ответа'
 
 
 class ExamAdmin(admin.ModelAdmin):
     list_display = ('title', 'category', 'author', 'revision',
-                    'questions_count', 'active', 'visibility', 'created')
+                    'questions_count', 'reliability', 'active', 'visibility',
+                    'created')
     list_editable = ('visibility',)
-    readonly_fields = ('author', 'slug', 'active',
-                       'revision', 'questions_count', 'created')
+    readonly_fields = ('author', 'slug', 'active', 'revision',
+                       'questions_count', 'reliability', 'created')
 
     inlines = (QuestionInline,)
     save_on_top = True
@@ -63,13 +76,26 @@ class ExamAdmin(admin.ModelAdmin):
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
-        return queryset.prefetch_related('questions').prefetch_related(
-            'category', 'author',)
+        return (
+            queryset
+            .select_related('category', 'author')
+            .annotate(
+                questions_count=Count('questions'),
+                reliability=F('analysis__reliability')
+            )
+        )
 
     def questions_count(self, obj):
-        return obj.questions.all().count()
+        return obj.questions_count
 
     questions_count.short_description = 'Вопросов'
+    questions_count.admin_order_field = 'questions_count'
+
+    def reliability(self, obj):
+        return format_analysis(obj.reliability)
+
+    reliability.short_description = 'Альфа Кронбаха'
+    reliability.admin_order_field = 'reliability'
 
     def save_model(self, request, obj, form, change):
         if getattr(obj, 'author', None) is None:
@@ -78,14 +104,39 @@ class ExamAdmin(admin.ModelAdmin):
 
 
 class QuestionAdmin(admin.ModelAdmin):
-    fields = ('exam', 'visibility', 'active', 'priority',
-              'type', 'description', 'text', 'success_message')
-    list_display = ('text', 'exam', 'priority')
+    fields = ('exam', 'visibility', 'active', 'priority', 'type',
+              'description', 'text', 'success_message', 'difficulty',
+              'discrimination')
+    list_display = ('text', 'exam', 'priority', 'difficulty',
+                    'discrimination')
     list_editable = ('priority',)
     raw_id_fields = ('exam',)
     inlines = (VariantInline,)
     save_on_top = True
-    readonly_fields = ('active',)
+    readonly_fields = ('active', 'difficulty', 'discrimination')
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        return (
+            queryset
+            .select_related('exam')
+            .annotate(
+                difficulty=F('analysis__difficulty'),
+                discrimination=F('analysis__discrimination')
+            )
+        )
+
+    def difficulty(self, obj):
+        return format_analysis(obj.difficulty)
+
+    difficulty.short_description = 'Трудность'
+    difficulty.admin_order_field = 'difficulty'
+
+    def discrimination(self, obj):
+        return format_analysis(obj.discrimination)
+
+    discrimination.short_description = 'Дискриминативность'
+    discrimination.admin_order_field = 'discrimination'
 
 
 admin.site.register(Category, CategoryAdmin)
@@ -0,0 +1,113 @@
+from django.apps import apps
+from django.db import transaction
+
+from .models import ExamAnalysis, Question, QuestionAnalysis
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ANSWERS_CHUNK_SIZE = 20000
+
+
+def load_matrix(exam_id: int) -> tuple:
+    question_ids = np.array(
+        Question.objects
+        .filter(exam_id=exam_id, active=True, visibility=True)
+        .order_by('id')
+        .values_list('id', flat=True),
+        dtype=np.int64
+    )
+    progress_ids = np.fromiter(
+        apps.get_model('progress', 'Progress').objects
+        .filter(exam_id=exam_id, finished__isnull=False)
+        .order_by('id')
+        .values_list('id', flat=True)
+        .iterator(chunk_size=ANSWERS_CHUNK_SIZE),
+        dtype=np.int64
+    )
+    answers = np.fromiter(
+        apps.get_model('progress', 'UserAnswer').objects
+        .filter(
+            question_id__in=question_ids.tolist(),
+            progress__finished__isnull=False,
+            correct=True
+        )
+        .order_by()
+        .values_list('progress_id', 'question_id')
+        .iterator(chunk_size=ANSWERS_CHUNK_SIZE),
+        dtype=[('progress', np.int64), ('question', np.int64)]
+    )
+    rows = np.searchsorted(progress_ids, answers['progress'])
+    found = rows < len(progress_ids)
+    found[found] = progress_ids[rows[found]] == answers['progress'][found]
+    cells = np.unique(
+        rows[found] * len(question_ids)
+        + np.searchsorted(question_ids, answers['question'][found])
+    )
+    rows, columns = np.divmod(cells, max(len(question_ids), 1))
+    return question_ids, len(progress_ids), rows, columns
+
+
+def item_statistics(attempts: int, questions: int, rows: object,
+                    columns: object) -> tuple:
+    totals = np.bincount(rows, minlength=attempts).astype(np.float64)
+    difficulty = np.bincount(columns, minlength=questions) / attempts
+    item_variance = difficulty * (1 - difficulty)
+    total_variance = totals.var()
+    covariance = (
+        np.bincount(columns, weights=totals[rows], minlength=questions)
+        / attempts - difficulty * totals.mean()
+    )
+    rest_variance = total_variance + item_variance - 2 * covariance
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        discrimination = (
+            (covariance - item_variance)
+            / np.sqrt(item_variance * rest_variance)
+        )
+    reliability = None
+    if questions > 1 and total_variance > 0:
+        reliability = (
+            questions / (questions - 1)
+            * (1 - item_variance.sum() / total_variance)
+        )
+    return difficulty, discrimination, reliability
+
+
+def to_float(value: object) -> float:
+    if value is None or np.isnan(value):
+        return None
+    return float(value)
+
+
+def analyze_exam(exam_id: int) -> ExamAnalysis:
+    question_ids, attempts, rows, columns = load_matrix(exam_id)
+    difficulty = discrimination = [None] * len(question_ids)
+    reliability = None
+
+    if attempts:
+        difficulty, discrimination, reliability = item_statistics(
+            attempts, len(question_ids), rows, columns)
+
+    with transaction.atomic():
+        QuestionAnalysis.objects.filter(question__exam_id=exam_id).delete()
+        QuestionAnalysis.objects.bulk_create([
+            QuestionAnalysis(
+                question_id=int(question_id),
+                attempts_count=attempts,
+                difficulty=to_float(question_difficulty),
+                discrimination=to_float(question_discrimination)
+            )
+            for question_id, question_difficulty, question_discrimination
+            in zip(question_ids, difficulty, discrimination)
+        ])
+        analysis, _ = ExamAnalysis.objects.update_or_create(
+            exam_id=exam_id,
+            defaults={
+                'attempts_count': attempts,
+                'reliability': to_float(reliability)
+            }
+        )
+    return analysis
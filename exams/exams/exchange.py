@@ -0,0 +1,156 @@
+import json
+
+from django.db import transaction
+
+from core.bulk import bulk_create
+
+from .activation import recompute_activation
+from .models import Category, Exam, Question, Variant
+from .utils import make_slug
+
+FIELDS = {
+    'category': (
+        Category,
+        ('title', 'slug', 'description', 'show_empty', 'priority')
+    ),
+    'exam': (
+        Exam,
+        ('title', 'slug', 'success_message', 'description', 'timer',
+         'required_percent', 'allow_retesting', 'show_results',
+         'show_correct', 'shuffle_variants', 'empty_answers', 'visibility')
+    ),
+    'question': (
+        Question,
+        ('type', 'text', 'description', 'success_message', 'priority',
+         'visibility')
+    ),
+    'variant': (
+        Variant,
+        ('text', 'priority', 'correct')
+    )
+}
+
+PARENTS = {
+    'exam': 'category',
+    'question': 'exam',
+    'variant': 'question'
+}
+
+
+class ExchangeError(Exception):
+    pass
+
+
+def export_records(exams: object, chunk_size: int = 2000) -> object:
+    querysets = {
+        'category': Category.objects.filter(
+            id__in=exams.values('category_id')),
+        'exam': exams,
+        'question': Question.objects.filter(exam__in=exams),
+        'variant': Variant.objects.filter(question__exam__in=exams)
+    }
+
+    for kind, queryset in querysets.items():
+        fields = FIELDS[kind][1]
+        parent = PARENTS.get(kind)
+        values = ['id', *fields]
+        if parent:
+            values.append(parent + '_id')
+        rows = queryset.order_by('id').values(*values)
+
+        for row in rows.iterator(chunk_size=chunk_size):
+            record = {'model': kind, 'id': row['id']}
+            record.update((field, row[field]) for field in fields)
+            if parent:
+                record[parent] = row[parent + '_id']
+            yield json.dumps(record, ensure_ascii=False)
+
+
+class Importer:
+
+    def __init__(self, batch_size: int = 1000):
+        self.batch_size = batch_size
+        self.ids = {kind: {} for kind in PARENTS.values()}
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.kind = None
+        self.pending = []
+
+    def add(self, record: dict) -> None:
+        kind = record.get('model')
+        if kind not in FIELDS:
+            raise ExchangeError(f'Неизвестный тип записи: {kind}')
+        if self.pending and (
+            kind != self.kind or len(self.pending) >= self.batch_size
+        ):
+            self.flush()
+        self.kind = kind
+        self.pending.append((record, self.build(kind, record)))
+
+    def get_parent_id(self, kind: str, record: dict) -> object:
+        parent = PARENTS[kind]
+        source_id = record.get(parent)
+        if source_id is None and parent == 'category':
+            return None
+        try:
+            return self.ids[parent][source_id]
+        except KeyError:
+            raise ExchangeError(
+                f'Запись {kind} {record.get("id")} ссылается на '
+                f'отсутствующую запись {parent} {source_id}'
+            ) from None
+
+    def build(self, kind: str, record: dict) -> object:
+        model, fields = FIELDS[kind]
+        values = {field: record[field] for field in fields if field in record}
+        if kind in PARENTS:
+            values[PARENTS[kind] + '_id'] = self.get_parent_id(kind, record)
+        return model(**values)
+
+    def set_slugs(self, model: object, objects: list) -> None:
+        for obj in objects:
+            obj.slug = obj.slug or make_slug(obj.title)
+        taken = set(
+            model.objects
+            .filter(slug__in=[obj.slug for obj in objects])
+            .values_list('slug', flat=True)
+        )
+
+        for obj in objects:
+            while obj.slug in taken:
+                obj.slug = make_slug(obj.title)
+            taken.add(obj.slug)
+
+    def flush(self) -> None:
+        kind, pending = self.kind, self.pending
+        model = FIELDS[kind][0]
+        objects = [obj for _, obj in pending]
+        self.pending = []
+
+        if kind in ('category', 'exam'):
+            self.set_slugs(model, objects)
+        bulk_create(model, objects)
+
+        self.counts[kind] += len(objects)
+        if kind in self.ids:
+            self.ids[kind].update(
+                (record.get('id'), obj.pk) for record, obj in pending)
+
+    def finish(self) -> dict:
+        if self.pending:
+            self.flush()
+        recompute_activation(exam_ids=set(self.ids['exam'].values()))
+        return self.counts
+
+
+@transaction.atomic
+def import_records(lines: object, batch_size: int = 1000) -> dict:
+    importer = Importer(batch_size)
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            importer.add(json.loads(line))
+        except (ValueError, ExchangeError) as error:
+            raise ExchangeError(f'Строка {number}: {error}') from error
+    return importer.finish()
@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+
+from django.db import transaction
+
+from progress.models import UserAnswer
+
+from .models import QuestionStats
+
+
+@dataclass(frozen=True)
+class GradedVariant:
+    variant_id: int
+    text: str
+    selected: bool
+    correct: bool
+
+
+@dataclass(frozen=True)
+class GradeResult:
+    correct: bool
+    no_answers: bool
+    variants: tuple
+    text: str = None
+
+
+def grade_one_correct(question, variants, result: int) -> GradeResult:
+    return GradeResult(
+        correct=result in question.correct_ids,
+        no_answers=False,
+        variants=tuple(
+            GradedVariant(
+                variant_id=variant.id,
+                text=variant.text,
+                selected=variant.id == result,
+                correct=variant.id in question.correct_ids
+            )
+            for variant in variants
+        )
+    )
+
+
+def grade_many_correct(
+        question,
+        variants,
+        results: list,
+        empty_answers: bool
+) -> GradeResult:
+    no_answers = empty_answers and not results
+    correct = (
+        not set(results) - question.correct_ids
+        and len(results) >= len(question.correct_ids)
+    )
+    return GradeResult(
+        correct=correct,
+        no_answers=no_answers,
+        variants=tuple(
+            GradedVariant(
+                variant_id=variant.id,
+                text=variant.text,
+                selected=variant.id in results,
+                correct=variant.id in question.correct_ids
+            )
+            for variant in variants
+        )
+    )
+
+
+def grade_text_answer(question, variants, answer: str) -> GradeResult:
+    corrects = {text.lower() for text in question.correct_texts}
+    correct = answer.lower() in corrects
+    return GradeResult(
+        correct=correct,
+        no_answers=False,
+        variants=tuple(
+            GradedVariant(
+                variant_id=variant.id,
+                text=variant.text,
+                selected=answer.lower() in variant.text.lower(),
+                correct=variant.text in question.correct_texts
+            )
+            for variant in variants
+        ),
+        text=answer
+    )
+
+
+@transaction.atomic(savepoint=False)
+def save_result(progress, question, result: GradeResult) -> UserAnswer:
+    answer = UserAnswer.objects.create(
+        progress=progress,
+        question_id=question.id,
+        correct=result.correct,
+        no_answers=result.no_answers,
+        selected_ids=[
+            variant.variant_id for variant in result.variants
+            if variant.selected
+        ],
+        correct_ids=[
+            variant.variant_id for variant in result.variants
+            if variant.correct
+        ],
+        text=result.text
+    )
+    QuestionStats.objects.add_answer(question.id, result.correct)
+    return answer
@@ -0,0 +1,36 @@
+from time import perf_counter
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams import analysis
+from exams.models import Exam
+
+
+class Command(BaseCommand):
+    help = ('Рассчитывает показатели качества вопросов: трудность, '
+            'дискриминативность и надежность теста (альфа Кронбаха)')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'slugs', nargs='*',
+            help='Адреса тестов, по умолчанию все тесты с попытками')
+
+    def handle(self, *args, **options):
+        if analysis.np is None:
+            raise CommandError('Для анализа вопросов нужен пакет numpy')
+
+        exams = Exam.objects.filter(progress__finished__isnull=False)
+        if options['slugs']:
+            exams = Exam.objects.filter(slug__in=options['slugs'])
+        exams = exams.order_by('id').distinct().values_list('id', 'title')
+
+        for exam_id, title in exams:
+            start = perf_counter()
+            result = analysis.analyze_exam(exam_id)
+            self.stdout.write(
+                f'{title}: попыток {result.attempts_count}, '
+                f'альфа {result.reliability}, '
+                f'{perf_counter() - start:.2f} с'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'Проанализировано тестов: {len(exams)}'))
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from exams.models import Exam, Question, Variant
+
+
+class RollbackError(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Считает количество SQL-запросов при сохранении теста '
+            'с вопросами и вариантами ответов, изменения откатываются')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--questions', type=int, default=100)
+        parser.add_argument('--variants', type=int, default=4)
+
+    def save_exam(self, questions_count, variants_count):
+        exam = Exam.objects.create(
+            title='Benchmark', description='Benchmark', visibility=True)
+        for number in range(questions_count):
+            question = Question.objects.create(
+                exam=exam, text=f'Question {number}', visibility=True)
+            for variant_number in range(variants_count):
+                Variant.objects.create(
+                    question=question,
+                    text=f'Variant {variant_number}',
+                    correct=variant_number == 0
+                )
+        exam.save()
+
+    def handle(self, *args, **options):
+        with CaptureQueriesContext(connection) as queries:
+            try:
+                with transaction.atomic():
+                    with TestCase.captureOnCommitCallbacks(execute=True):
+                        self.save_exam(
+                            options['questions'], options['variants'])
+                    raise RollbackError
+            except RollbackError:
+                pass
+
+        self.stdout.write(
+            f'Вопросов: {options["questions"]}, '
+            f'вариантов в вопросе: {options["variants"]}, '
+            f'SQL-запросов: {len(queries)}'
+        )
@@ -0,0 +1,34 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from exams.exchange import export_records
+from exams.models import Exam
+
+
+class Command(BaseCommand):
+    help = ('Выгружает категории, тесты, вопросы и варианты ответов '
+            'в файл формата JSON Lines')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Путь к файлу, по умолчанию стандартный вывод')
+        parser.add_argument(
+            '--exam', action='append', dest='slugs', default=[],
+            help='ЧПУ теста, можно указать несколько раз')
+
+    def handle(self, *args, **options):
+        exams = Exam.objects.all()
+        if options['slugs']:
+            exams = exams.filter(slug__in=options['slugs'])
+
+        if options['path'] == '-':
+            self.export(exams, sys.stdout)
+            return
+        with open(options['path'], 'w', encoding='utf-8') as file:
+            self.export(exams, file)
+
+    def export(self, exams, file):
+        for line in export_records(exams):
+            file.write(line + '\n')
@@ -0,0 +1,32 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from exams.exchange import ExchangeError, import_records
+
+
+class Command(BaseCommand):
+    help = ('Загружает категории, тесты, вопросы и варианты ответов '
+            'из файла формата JSON Lines без сохранения каждой записи')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', nargs='?', default='-',
+            help='Путь к файлу, по умолчанию стандартный ввод')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            if options['path'] == '-':
+                counts = import_records(sys.stdin, options['batch_size'])
+            else:
+                with open(options['path'], encoding='utf-8') as file:
+                    counts = import_records(file, options['batch_size'])
+        except (OSError, ExchangeError) as error:
+            raise CommandError(error) from error
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Загружено категорий: {counts["category"]}, '
+            f'тестов: {counts["exam"]}, вопросов: {counts["question"]}, '
+            f'вариантов ответов: {counts["variant"]}'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from exams.models import ExamStats, QuestionStats
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает статистику тестов и вопросов по истории ответов'
+
+    def handle(self, *args, **options):
+        exams_count = ExamStats.objects.rebuild()
+        questions_count = QuestionStats.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Статистика пересчитана для {exams_count} тестов '
+            f'и {questions_count} вопросов'
+        ))
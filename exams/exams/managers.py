@@ -1,8 +1,11 @@
-from itertools import chain
-from operator import attrgetter
+from collections import Counter, defaultdict
 
-from django.db.models import (Count, ExpressionWrapper, F, IntegerField,
-                              Manager, Q, QuerySet)
+from django.apps import apps
+from django.db import transaction
+from django.db.models import (Count, ExpressionWrapper, F,
+                              FilteredRelation, IntegerField, Manager,
+                              OuterRef, Q, QuerySet, Subquery, Sum)
+from django.db.models.functions import Coalesce
 from django.db.models.functions.comparison import NullIf
 
 
@@ -25,13 +28,18 @@ class CategoryManager(Manager):
 class ExamQuerySet(QuerySet):
 
     def questions_count(self):
+        questions = (
+            apps.get_model('exams', 'Question').objects
+            .filter(exam=OuterRef('pk'), visibility=True, active=True)
+            .order_by()
+            .values('exam')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
         count = (
             self
             .annotate(
-                questions_count=Count('questions', distinct=True, filter=Q(
-                    questions__visibility=True,
-                    questions__active=True
-                ))
+                questions_count=Coalesce(Subquery(questions), 0)
             )
         )
         return count
@@ -40,17 +48,10 @@ class ExamQuerySet(QuerySet):
         stats = (
             self
             .annotate(
-                users_count=Count('progress__user', distinct=True, filter=Q(
-                    progress__finished__isnull=False
-                )),
-                average_progress=ExpressionWrapper(NullIf(Count(
-                    'progress__answers', distinct=True, filter=Q(
-                        progress__finished__isnull=False,
-                        progress__answers__correct=True
-                    )), 0) * 100 / NullIf(Count(
-                        'progress__answers', distinct=True, filter=Q(
-                            progress__finished__isnull=False
-                        )), 0),
+                users_count=Coalesce(F('stats__users_count'), 0),
+                average_progress=ExpressionWrapper(
+                    NullIf(F('stats__correct_answers_count'), 0) * 100
+                    / NullIf(F('stats__answers_count'), 0),
                     output_field=IntegerField()
                 )
             )
@@ -85,57 +86,70 @@ class ExamQuerySet(QuerySet):
         )
         return progress
 
-    def list_(self, user: object = None, only_user: bool = False) -> object:
-        filter_data = {
-            'visibility': True,
-            'active': True
-        }
-        fields_only = ['title', 'slug', 'created', 'category__title']
+    def with_latest_progress(self, user: object) -> object:
+        correct = (
+            apps.get_model('progress', 'UserAnswer').objects
+            .filter(progress=OuterRef('progress_id'), correct=True)
+            .order_by()
+            .values('progress')
+            .annotate(count=Count('id'))
+            .values('count')
+        )
+        exams = self
+        if 'questions_count' not in self.query.annotations:
+            exams = exams.questions_count()
 
-        try:
-            user_progress = (
-                self
-                .filter(progress__user=user)
-                .order_by('progress__exam__id', '-progress__started')
-                .distinct('progress__exam__id')
-                .values('progress__id')
-            )
-            filter_data['progress__id__in'] = user_progress
-            exams = self.filter(**filter_data).with_request_user_progress()
-
-            if only_user is False:
-                exams = exams.only(*fields_only).questions_count()
-                query_without_user = (
-                    self
-                    .users_stats()
-                    .filter(~Q(id__in=exams))
-                    .only(*fields_only)
-                    .questions_count()
+        progress = (
+            exams
+            .annotate(
+                latest=FilteredRelation(
+                    'latest_progress',
+                    condition=Q(latest_progress__user=user)
                 )
-
-                if user.hide_finished_exams:
-                    return query_without_user.order_by('-created')
-
-                exams = sorted(
-                    list(chain(query_without_user, exams)),
-                    key=attrgetter('created'), reverse=True
+            )
+            .annotate(
+                progress_id=F('latest__progress_id'),
+                current_answers=F('latest__progress__answers_quantity'),
+                current_stage=F('latest__progress__stage'),
+                started=F('latest__progress__started'),
+                finished=F('latest__progress__finished'),
+                passed=F('latest__progress__passed')
+            )
+            .annotate(
+                percentage_answers=ExpressionWrapper(
+                    F('current_answers') * 100
+                    / NullIf(F('questions_count'), 0),
+                    output_field=IntegerField()
+                ),
+                percentage_correct=ExpressionWrapper(
+                    Subquery(correct) * 100 / F('current_answers'),
+                    output_field=IntegerField()
                 )
-                return exams
-            else:
-                return exams.only(*fields_only).questions_count()
-
-        except TypeError:
-            pass
+            )
+        )
+        return progress
 
+    def list_(self, user: object = None, only_user: bool = False) -> object:
+        fields_only = ['title', 'slug', 'created', 'category__title']
         exams = (
             self
-            .users_stats()
-            .filter(**filter_data)
+            .filter(visibility=True, active=True)
             .only(*fields_only)
             .questions_count()
-            .order_by('-created')
         )
-        return exams
+
+        if user is None or not user.is_authenticated:
+            return exams.users_stats().order_by('-created')
+
+        exams = exams.with_latest_progress(user)
+
+        if only_user:
+            return exams.filter(progress_id__isnull=False)
+
+        if user.hide_finished_exams:
+            exams = exams.filter(progress_id__isnull=True)
+
+        return exams.users_stats().order_by('-created')
 
 
 class ExamManager(Manager):
@@ -152,5 +166,173 @@ class ExamManager(Manager):
     def with_request_user_progress(self):
         return self.get_queryset().with_request_user_progress()
 
+    def with_latest_progress(self, user: object) -> object:
+        return self.get_queryset().with_latest_progress(user)
+
     def list_(self, user: object = None, only_user: bool = False) -> object:
         return self.get_queryset().list_(user, only_user)
+
+
+class CounterManager(Manager):
+
+    def increment(self, pk: int, **values) -> None:
+        changes = {field: F(field) + value for field, value in values.items()}
+
+        if not self.filter(pk=pk).update(**changes):
+            self.bulk_create([self.model(pk=pk)], ignore_conflicts=True)
+            self.filter(pk=pk).update(**changes)
+
+
+class ExamStatsManager(CounterManager):
+
+    def add_attempt(self, exam_id: int) -> None:
+        self.increment(exam_id, attempts_count=1)
+
+    def add_finished(self, progress: object, passed: bool) -> None:
+        progress_model = apps.get_model('progress', 'Progress')
+        answers = (
+            apps.get_model('progress', 'UserAnswer').objects
+            .filter(progress=progress)
+            .aggregate(
+                total=Count('id'),
+                correct=Count('id', filter=Q(correct=True))
+            )
+        )
+        finished_before = (
+            progress_model.objects
+            .filter(
+                user_id=progress.user_id,
+                exam_id=progress.exam_id,
+                finished__isnull=False
+            )
+            .exclude(id=progress.id)
+            .exists()
+        )
+        self.increment(
+            progress.exam_id,
+            finished_count=1,
+            users_count=0 if finished_before else 1,
+            passed_count=1 if passed else 0,
+            answers_count=answers['total'],
+            correct_answers_count=answers['correct']
+        )
+
+    def rebuild(self) -> int:
+        progress = (
+            apps.get_model('progress', 'Progress').objects
+            .order_by()
+            .values('exam')
+            .annotate(
+                attempts_count=Count('id'),
+                finished_count=Count('id', filter=Q(finished__isnull=False)),
+                users_count=Count('user', distinct=True, filter=Q(
+                    finished__isnull=False
+                )),
+                passed_count=Count('id', filter=Q(
+                    finished__isnull=False,
+                    passed=True
+                ))
+            )
+        )
+        answers = (
+            apps.get_model('progress', 'UserAnswer').objects
+            .filter(progress__finished__isnull=False)
+            .order_by()
+            .values('progress__exam')
+            .annotate(
+                answers_count=Count('id'),
+                correct_answers_count=Count('id', filter=Q(correct=True))
+            )
+        )
+        archived = (
+            apps.get_model('progress', 'ArchivedProgress').objects
+            .order_by()
+            .values('exam')
+            .annotate(
+                attempts_count=Count('id'),
+                finished_count=Count('id'),
+                passed_count=Count('id', filter=Q(passed=True)),
+                answers_count=Sum('answers_count'),
+                correct_answers_count=Sum('correct_count')
+            )
+        )
+        totals = defaultdict(Counter)
+
+        for rows, field in (
+            (progress, 'exam'),
+            (answers, 'progress__exam'),
+            (archived, 'exam')
+        ):
+            for row in rows:
+                totals[row.pop(field)].update(row)
+
+        stats = [
+            self.model(exam_id=exam_id, **row)
+            for exam_id, row in totals.items()
+        ]
+
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(stats, batch_size=1000)
+        return len(stats)
+
+
+class QuestionStatsManager(CounterManager):
+
+    def add_answer(self, question_id: int, correct: bool) -> None:
+        self.increment(
+            question_id,
+            answers_count=1,
+            correct_count=1 if correct else 0
+        )
+
+    def percentages(self, question_ids: list) -> dict:
+        stats = (
+            self
+            .filter(question_id__in=question_ids)
+            .annotate(
+                percentage=ExpressionWrapper(
+                    NullIf(F('correct_count'), 0) * 100
+                    / NullIf(F('answers_count'), 0),
+                    output_field=IntegerField()
+                )
+            )
+            .values_list('question_id', 'percentage')
+        )
+        return dict(stats)
+
+    def rebuild(self) -> int:
+        answers = (
+            apps.get_model('progress', 'UserAnswer').objects
+            .filter(question__isnull=False)
+            .order_by()
+            .values('question')
+            .annotate(
+                answers_count=Count('id'),
+                correct_count=Count('id', filter=Q(correct=True))
+            )
+        )
+        stats = {
+            row['question']: self.model(
+                question_id=row['question'],
+                answers_count=row['answers_count'],
+                correct_count=row['correct_count']
+            )
+            for row in answers
+        }
+
+        with transaction.atomic():
+            archived = self.filter(archived_answers_count__gt=0).values_list(
+                'question', 'archived_answers_count', 'archived_correct_count')
+
+            for question_id, answers_count, correct_count in archived:
+                stat = stats.setdefault(
+                    question_id, self.model(question_id=question_id))
+                stat.answers_count += answers_count
+                stat.correct_count += correct_count
+                stat.archived_answers_count = answers_count
+                stat.archived_correct_count = correct_count
+
+            self.all().delete()
+            self.bulk_create(stats.values(), batch_size=1000)
+        return len(stats)
@@ -0,0 +1,70 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:34
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def fill_stats(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Progress = apps.get_model('progress', 'Progress')
+    UserAnswer = apps.get_model('progress', 'UserAnswer')
+    ExamStats = apps.get_model('exams', 'ExamStats')
+    answers = {
+        row.pop('progress__exam'): row for row in (
+            UserAnswer.objects.using(db_alias)
+            .filter(progress__finished__isnull=False)
+            .order_by()
+            .values('progress__exam')
+            .annotate(
+                answers_count=Count('id'),
+                correct_answers_count=Count('id', filter=Q(correct=True))
+            )
+        )
+    }
+    stats = []
+    for row in (
+        Progress.objects.using(db_alias)
+        .order_by()
+        .values('exam')
+        .annotate(
+            attempts_count=Count('id'),
+            finished_count=Count('id', filter=Q(finished__isnull=False)),
+            users_count=Count(
+                'user', distinct=True, filter=Q(finished__isnull=False)),
+            passed_count=Count(
+                'id', filter=Q(finished__isnull=False, passed=True))
+        )
+    ):
+        exam_id = row.pop('exam')
+        row.update(answers.get(exam_id, {}))
+        stats.append(ExamStats(exam_id=exam_id, **row))
+    ExamStats.objects.using(db_alias).bulk_create(stats, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0009_alter_exam_options'),
+        ('progress', '0002_progress_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamStats',
+            fields=[
+                ('exam', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='exams.exam', verbose_name='Тестирование')),
+                ('attempts_count', models.PositiveIntegerField(default=0, verbose_name='Попыток')),
+                ('finished_count', models.PositiveIntegerField(default=0, verbose_name='Завершенных попыток')),
+                ('users_count', models.PositiveIntegerField(default=0, verbose_name='Пользователей завершивших тест')),
+                ('passed_count', models.PositiveIntegerField(default=0, verbose_name='Зачтенных попыток')),
+                ('answers_count', models.PositiveIntegerField(default=0, verbose_name='Ответов в завершенных попытках')),
+                ('correct_answers_count', models.PositiveIntegerField(default=0, verbose_name='Верных ответов в завершенных попытках')),
+            ],
+            options={
+                'verbose_name': 'Статистика теста',
+                'verbose_name_plural': 'Статистика тестов',
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
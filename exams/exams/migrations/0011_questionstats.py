@@ -0,0 +1,51 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:39
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+import django.db.models.deletion
+
+
+def fill_stats(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    UserAnswer = apps.get_model('progress', 'UserAnswer')
+    QuestionStats = apps.get_model('exams', 'QuestionStats')
+    answers = (
+        UserAnswer.objects.using(db_alias)
+        .filter(question__isnull=False)
+        .order_by()
+        .values('question')
+        .annotate(
+            answers_count=Count('id'),
+            correct_count=Count('id', filter=Q(correct=True))
+        )
+    )
+    QuestionStats.objects.using(db_alias).bulk_create(
+        [
+            QuestionStats(question_id=row.pop('question'), **row)
+            for row in answers
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0010_examstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='exams.question', verbose_name='Вопрос')),
+                ('answers_count', models.PositiveIntegerField(default=0, verbose_name='Ответов')),
+                ('correct_count', models.PositiveIntegerField(default=0, verbose_name='Верных ответов')),
+            ],
+            options={
+                'verbose_name': 'Статистика вопроса',
+                'verbose_name_plural': 'Статистика вопросов',
+            },
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
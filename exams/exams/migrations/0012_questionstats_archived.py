@@ -0,0 +1,23 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0011_questionstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionstats',
+            name='archived_answers_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Ответов в архиве'),
+        ),
+        migrations.AddField(
+            model_name='questionstats',
+            name='archived_correct_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Верных ответов в архиве'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:18
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core.operations import AddIndexConcurrently, AlterFieldIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('exams', '0012_questionstats_archived'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='exam',
+            index=models.Index(fields=['visibility', 'active', '-created'], name='exams_exam_list_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='question',
+            index=models.Index(fields=['exam', 'visibility', 'active', 'priority', 'id'], name='exams_question_order_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='variant',
+            index=models.Index(fields=['question', 'priority', 'id'], name='exams_variant_order_idx'),
+        ),
+        AlterFieldIndexConcurrently(
+            model_name='question',
+            name='exam',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='questions', to='exams.exam', verbose_name='Тестирование'),
+        ),
+        AlterFieldIndexConcurrently(
+            model_name='variant',
+            name='question',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='variants', to='exams.question', verbose_name='Вопрос'),
+        ),
+    ]
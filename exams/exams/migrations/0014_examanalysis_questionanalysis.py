@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0013_exam_question_variant_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamAnalysis',
+            fields=[
+                ('exam', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analysis', serialize=False, to='exams.exam', verbose_name='Тестирование')),
+                ('attempts_count', models.PositiveIntegerField(default=0, verbose_name='Попыток в анализе')),
+                ('reliability', models.FloatField(blank=True, null=True, verbose_name='Надежность (альфа Кронбаха)')),
+                ('analyzed', models.DateTimeField(auto_now=True, verbose_name='Дата анализа')),
+            ],
+            options={
+                'verbose_name': 'Анализ теста',
+                'verbose_name_plural': 'Анализ тестов',
+            },
+        ),
+        migrations.CreateModel(
+            name='QuestionAnalysis',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analysis', serialize=False, to='exams.question', verbose_name='Вопрос')),
+                ('attempts_count', models.PositiveIntegerField(default=0, verbose_name='Попыток в анализе')),
+                ('difficulty', models.FloatField(blank=True, null=True, verbose_name='Трудность (доля верных ответов)')),
+                ('discrimination', models.FloatField(blank=True, null=True, verbose_name='Дискриминативность (точечно-бисериальная корреляция)')),
+                ('analyzed', models.DateTimeField(auto_now=True, verbose_name='Дата анализа')),
+            ],
+            options={
+                'verbose_name': 'Анализ вопроса',
+                'verbose_name_plural': 'Анализ вопросов',
+            },
+        ),
+    ]
@@ -1,14 +1,12 @@
-from random import randrange
-
 from ckeditor_uploader.fields import RichTextUploadingField
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from django.urls import reverse
 from django.utils import timezone
-from slugify import slugify
 from users.models import User
 
 from . import managers
+from .utils import make_slug
 
 
 class Category(models.Model):
@@ -50,11 +48,8 @@ class Category(models.Model):
         return f'{self.title}'
 
     def save(self, *args, **kwargs):
-        if self._state.adding:
-            code = randrange(10000, 99999)
-        else:
-            code = self.slug[-5:]
-        self.slug = slugify(self.title) + '-' + str(code)
+        code = None if self._state.adding else self.slug[-5:]
+        self.slug = make_slug(self.title, code)
         super().save(*args, **kwargs)
 
 
@@ -164,18 +159,23 @@ class Exam(models.Model):
         verbose_name = 'Тест'
         verbose_name_plural = 'Тесты'
         ordering = ['-created']
+        indexes = [
+            models.Index(
+                fields=['visibility', 'active', '-created'],
+                name='exams_exam_list_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.title}'
 
     def save(self, *args, **kwargs):
-        if self._state.adding:
-            code = randrange(10000, 99999)
-        else:
+        code = None
+        if not self._state.adding:
             code = self.slug[-5:]
             if self.active and self.visibility:
                 self.revision = timezone.now()
-        self.slug = slugify(self.title) + '-' + str(code)
+        self.slug = make_slug(self.title, code)
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -222,7 +222,7 @@ class Question(models.Model):
         verbose_name='Тестирование',
         related_name='questions',
         on_delete=models.CASCADE,
-        db_index=True
+        db_index=False
     )
     type = models.CharField(
         verbose_name='Тип',
@@ -258,6 +258,12 @@ class Question(models.Model):
         verbose_name = 'Вопрос'
         verbose_name_plural = 'Вопросы'
         ordering = ['-visibility', '-active', 'priority', 'id']
+        indexes = [
+            models.Index(
+                fields=['exam', 'visibility', 'active', 'priority', 'id'],
+                name='exams_question_order_idx'
+            )
+        ]
 
     def __str__(self):
         if len(self.text) > 48:
@@ -287,7 +293,7 @@ class Variant(models.Model):
         verbose_name='Вопрос',
         related_name='variants',
         on_delete=models.CASCADE,
-        db_index=True
+        db_index=False
     )
 
     @property
@@ -298,8 +304,157 @@ class Variant(models.Model):
         verbose_name = 'Вариант ответа'
         verbose_name_plural = 'Варианты ответов'
         ordering = ['priority', 'id', 'text']
+        indexes = [
+            models.Index(
+                fields=['question', 'priority', 'id'],
+                name='exams_variant_order_idx'
+            )
+        ]
 
     def __str__(self):
         if len(self.text) > 48:
             return f'{self.text[:48]}...'
         return f'{self.text}'
+
+
+class ExamStats(models.Model):
+    exam = models.OneToOneField(
+        Exam,
+        verbose_name='Тестирование',
+        related_name='stats',
+        primary_key=True,
+        on_delete=models.CASCADE
+    )
+    attempts_count = models.PositiveIntegerField(
+        verbose_name='Попыток',
+        default=0
+    )
+    finished_count = models.PositiveIntegerField(
+        verbose_name='Завершенных попыток',
+        default=0
+    )
+    users_count = models.PositiveIntegerField(
+        verbose_name='Пользователей завершивших тест',
+        default=0
+    )
+    passed_count = models.PositiveIntegerField(
+        verbose_name='Зачтенных попыток',
+        default=0
+    )
+    answers_count = models.PositiveIntegerField(
+        verbose_name='Ответов в завершенных попытках',
+        default=0
+    )
+    correct_answers_count = models.PositiveIntegerField(
+        verbose_name='Верных ответов в завершенных попытках',
+        default=0
+    )
+
+    objects = managers.ExamStatsManager()
+
+    class Meta:
+        verbose_name = 'Статистика теста'
+        verbose_name_plural = 'Статистика тестов'
+
+    def __str__(self):
+        return f'{self.exam_id}'
+
+
+class QuestionStats(models.Model):
+    question = models.OneToOneField(
+        Question,
+        verbose_name='Вопрос',
+        related_name='stats',
+        primary_key=True,
+        on_delete=models.CASCADE
+    )
+    answers_count = models.PositiveIntegerField(
+        verbose_name='Ответов',
+        default=0
+    )
+    correct_count = models.PositiveIntegerField(
+        verbose_name='Верных ответов',
+        default=0
+    )
+    archived_answers_count = models.PositiveIntegerField(
+        verbose_name='Ответов в архиве',
+        default=0
+    )
+    archived_correct_count = models.PositiveIntegerField(
+        verbose_name='Верных ответов в архиве',
+        default=0
+    )
+
+    objects = managers.QuestionStatsManager()
+
+    class Meta:
+        verbose_name = 'Статистика вопроса'
+        verbose_name_plural = 'Статистика вопросов'
+
+    def __str__(self):
+        return f'{self.question_id}'
+
+
+class ExamAnalysis(models.Model):
+    exam = models.OneToOneField(
+        Exam,
+        verbose_name='Тестирование',
+        related_name='analysis',
+        primary_key=True,
+        on_delete=models.CASCADE
+    )
+    attempts_count = models.PositiveIntegerField(
+        verbose_name='Попыток в анализе',
+        default=0
+    )
+    reliability = models.FloatField(
+        verbose_name='Надежность (альфа Кронбаха)',
+        null=True,
+        blank=True
+    )
+    analyzed = models.DateTimeField(
+        verbose_name='Дата анализа',
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = 'Анализ теста'
+        verbose_name_plural = 'Анализ тестов'
+
+    def __str__(self):
+        return f'{self.exam_id}'
+
+
+class QuestionAnalysis(models.Model):
+    question = models.OneToOneField(
+        Question,
+        verbose_name='Вопрос',
+        related_name='analysis',
+        primary_key=True,
+        on_delete=models.CASCADE
+    )
+    attempts_count = models.PositiveIntegerField(
+        verbose_name='Попыток в анализе',
+        default=0
+    )
+    difficulty = models.FloatField(
+        verbose_name='Трудность (доля верных ответов)',
+        null=True,
+        blank=True
+    )
+    discrimination = models.FloatField(
+        verbose_name='Дискриминативность (точечно-бисериальная корреляция)',
+        null=True,
+        blank=True
+    )
+    analyzed = models.DateTimeField(
+        verbose_name='Дата анализа',
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = 'Анализ вопроса'
+        verbose_name_plural = 'Анализ вопросов'
+
+    def __str__(self):
+        return f'{self.question_id}'
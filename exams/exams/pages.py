@@ -0,0 +1,13 @@
+from core.cache import bump_versions
+
+CATALOG_PAGES = 'pages:catalog'
+ATTEMPTS_PAGES = 'pages:attempts'
+EXAM_PAGES = 'pages:exam:{}'
+
+
+def invalidate_catalog_pages() -> None:
+    bump_versions(CATALOG_PAGES)
+
+
+def invalidate_exam_pages(slug: str) -> None:
+    bump_versions(ATTEMPTS_PAGES, EXAM_PAGES.format(slug))
@@ -0,0 +1,138 @@
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Exam, Question
+
+CACHE_KEY = 'exam-snapshot:{}'
+
+
+@dataclass(frozen=True)
+class CategorySnapshot:
+    title: str
+    slug: str
+
+
+@dataclass(frozen=True)
+class VariantSnapshot:
+    id: int
+    text: str
+    correct: bool
+
+
+@dataclass(frozen=True)
+class QuestionSnapshot:
+    id: int
+    type: str
+    text: str
+    description: str
+    success_message: str
+    variants: tuple
+    correct_ids: frozenset
+    correct_texts: frozenset
+
+    @property
+    def one_correct(self):
+        return self.type == Question.ONE_CORRECT
+
+    @property
+    def many_correct(self):
+        return self.type == Question.MANY_CORRECT
+
+    @property
+    def text_answer(self):
+        return self.type == Question.TEXT_ANSWER
+
+
+@dataclass(frozen=True)
+class ExamSnapshot:
+    id: int
+    slug: str
+    title: str
+    revision: object
+    category: CategorySnapshot
+    success_message: str
+    timer: int
+    required_percent: int
+    allow_retesting: bool
+    show_results: bool
+    show_correct: bool
+    shuffle_variants: bool
+    empty_answers: bool
+    questions: tuple
+
+
+def build_exam_snapshot(exam_id: int) -> ExamSnapshot:
+    exam = Exam.objects.select_related('category').get(id=exam_id)
+    questions = (
+        exam.questions
+        .filter(active=True, visibility=True)
+        .prefetch_related('variants')
+        .order_by('priority', 'id')
+    )
+    category = None
+
+    if exam.category:
+        category = CategorySnapshot(
+            title=exam.category.title,
+            slug=exam.category.slug
+        )
+
+    return ExamSnapshot(
+        id=exam.id,
+        slug=exam.slug,
+        title=exam.title,
+        revision=exam.revision,
+        category=category,
+        success_message=exam.success_message,
+        timer=exam.timer,
+        required_percent=exam.required_percent,
+        allow_retesting=exam.allow_retesting,
+        show_results=exam.show_results,
+        show_correct=exam.show_correct,
+        shuffle_variants=exam.shuffle_variants,
+        empty_answers=exam.empty_answers,
+        questions=tuple(
+            QuestionSnapshot(
+                id=question.id,
+                type=question.type,
+                text=question.text,
+                description=question.description,
+                success_message=question.success_message,
+                variants=tuple(
+                    VariantSnapshot(
+                        id=variant.id,
+                        text=variant.text,
+                        correct=variant.correct
+                    )
+                    for variant in question.variants.all()
+                ),
+                correct_ids=frozenset(
+                    variant.id for variant in question.variants.all()
+                    if variant.correct
+                ),
+                correct_texts=frozenset(
+                    variant.text for variant in question.variants.all()
+                    if variant.correct
+                )
+            )
+            for question in questions
+        )
+    )
+
+
+def get_exam_snapshot(exam: Exam) -> ExamSnapshot:
+    snapshot = cache.get(CACHE_KEY.format(exam.id))
+
+    if snapshot is None or snapshot.revision != exam.revision:
+        snapshot = build_exam_snapshot(exam.id)
+        cache.set(
+            CACHE_KEY.format(exam.id), snapshot,
+            settings.EXAM_SNAPSHOT_TIMEOUT
+        )
+    return snapshot
+
+
+def invalidate_exam_snapshot(exam_id: int) -> None:
+    cache.delete(CACHE_KEY.format(exam_id))
@@ -0,0 +1,41 @@
+from django.conf import settings
+
+from core.cache import get_or_compute, mark_stale
+
+from .models import Category, Exam
+
+CATEGORY_COUNTS_KEY = 'category-counts'
+EXAM_STATS_KEY = 'exam-stats:{}'
+
+
+def get_category_counts() -> list:
+    return get_or_compute(
+        CATEGORY_COUNTS_KEY,
+        lambda: list(Category.objects.exams_count()),
+        settings.CATEGORY_COUNTS_TIMEOUT
+    )
+
+
+def get_exam_stats(exam_id: int) -> dict:
+    return get_or_compute(
+        EXAM_STATS_KEY.format(exam_id),
+        lambda: (
+            Exam.objects
+            .filter(id=exam_id)
+            .users_stats()
+            .questions_count()
+            .values('users_count', 'average_progress', 'questions_count')
+            .first()
+        ),
+        settings.EXAM_STATS_TIMEOUT
+    )
+
+
+def invalidate_exam_stats(exam_id: int) -> None:
+    mark_stale(EXAM_STATS_KEY.format(exam_id), settings.EXAM_STATS_TIMEOUT)
+
+
+def invalidate_exam_counters(exam_ids: set) -> None:
+    mark_stale(CATEGORY_COUNTS_KEY, settings.CATEGORY_COUNTS_TIMEOUT)
+    for exam_id in exam_ids:
+        invalidate_exam_stats(exam_id)
@@ -0,0 +1,45 @@
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase
+
+from exams import activation
+from exams.models import Exam, Question, Variant
+
+
+class ScheduleRecomputeTest(TestCase):
+
+    def create_exam(self):
+        exam = Exam.objects.create(title='Тест', visibility=True)
+        question = Question.objects.create(
+            exam=exam, text='Вопрос', visibility=True)
+        Variant.objects.create(question=question, text='Да', correct=True)
+        Variant.objects.create(question=question, text='Нет', correct=False)
+        return exam
+
+    def test_recompute_once_per_transaction(self):
+        with mock.patch.object(
+            activation, 'recompute_activation',
+            wraps=activation.recompute_activation
+        ) as recompute:
+            with self.captureOnCommitCallbacks(execute=True):
+                exam = self.create_exam()
+
+        recompute.assert_called_once()
+        exam.refresh_from_db()
+        self.assertTrue(exam.active)
+
+    def test_recompute_after_rollback(self):
+        try:
+            with transaction.atomic():
+                self.create_exam()
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        with self.captureOnCommitCallbacks(execute=True):
+            exam = self.create_exam()
+
+        exam.refresh_from_db()
+        self.assertTrue(exam.active)
+        self.assertEqual(activation.get_batches(), {})
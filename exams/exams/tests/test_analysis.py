@@ -0,0 +1,98 @@
+from unittest import skipUnless
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from exams.analysis import analyze_exam, item_statistics, np
+from exams.models import Exam, Question, QuestionAnalysis
+from progress.models import Progress, UserAnswer
+from users.models import User
+
+
+@skipUnless(np, 'Нужен пакет numpy')
+class ItemStatisticsTest(SimpleTestCase):
+
+    def test_matches_numpy_reference(self):
+        matrix = np.random.default_rng(2024).integers(0, 2, size=(40, 6))
+        matrix[:, 5] = 0
+        rows, columns = np.nonzero(matrix)
+
+        difficulty, discrimination, reliability = item_statistics(
+            *matrix.shape, rows, columns)
+
+        totals = matrix.sum(axis=1)
+        expected_discrimination = [
+            np.corrcoef(matrix[:, column], totals - matrix[:, column])[0, 1]
+            for column in range(5)
+        ]
+        expected_reliability = (
+            6 / 5 * (1 - matrix.var(axis=0).sum() / totals.var()))
+
+        np.testing.assert_allclose(difficulty, matrix.mean(axis=0))
+        np.testing.assert_allclose(
+            discrimination[:5], expected_discrimination)
+        self.assertTrue(np.isnan(discrimination[5]))
+        self.assertAlmostEqual(reliability, expected_reliability)
+
+    def test_single_question_has_no_reliability(self):
+        rows = np.array([0, 2])
+        columns = np.array([0, 0])
+
+        difficulty, _, reliability = item_statistics(3, 1, rows, columns)
+
+        np.testing.assert_allclose(difficulty, [2 / 3])
+        self.assertIsNone(reliability)
+
+
+@skipUnless(np, 'Нужен пакет numpy')
+class AnalyzeExamTest(TestCase):
+
+    def create_exam(self, questions_count):
+        exam = Exam.objects.create(
+            title=f'Тест {questions_count}', visibility=True)
+        for number in range(questions_count):
+            Question.objects.create(
+                exam=exam, text=f'Вопрос {number}', visibility=True)
+        exam.questions.update(active=True)
+        return exam
+
+    def create_attempt(self, exam, number, results, finished=True):
+        user = User.objects.create_user(
+            email=f'user{exam.id}-{number}@example.com',
+            username=f'user{exam.id}-{number}', password='password')
+        progress = Progress.objects.create(
+            user=user, exam=exam,
+            finished=timezone.now() if finished else None)
+        UserAnswer.objects.bulk_create([
+            UserAnswer(progress=progress, question=question, correct=correct)
+            for question, correct in zip(
+                exam.questions.order_by('id'), results)
+        ])
+
+    def test_exam_without_finished_attempts(self):
+        exam = self.create_exam(2)
+        self.create_attempt(exam, 1, (True, False), finished=False)
+
+        analysis = analyze_exam(exam.id)
+
+        self.assertEqual(analysis.attempts_count, 0)
+        self.assertIsNone(analysis.reliability)
+        self.assertEqual(
+            list(QuestionAnalysis.objects.filter(
+                question__exam=exam).values_list(
+                    'attempts_count', 'difficulty', 'discrimination')),
+            [(0, None, None), (0, None, None)]
+        )
+
+    def test_single_question_exam(self):
+        exam = self.create_exam(1)
+        for number, correct in enumerate((True, False, True, True)):
+            self.create_attempt(exam, number, (correct,))
+
+        analysis = analyze_exam(exam.id)
+
+        self.assertEqual(analysis.attempts_count, 4)
+        self.assertIsNone(analysis.reliability)
+        question = QuestionAnalysis.objects.get(question__exam=exam)
+        self.assertAlmostEqual(question.difficulty, 0.75)
+        self.assertIsNone(question.discrimination)
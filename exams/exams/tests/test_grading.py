@@ -0,0 +1,248 @@
+from random import Random
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from exams.forms import ExamProcessForm
+from exams.models import Question
+from exams.snapshots import QuestionSnapshot, VariantSnapshot
+
+CASES_COUNT = 3000
+
+WORDS = (
+    'Paris', 'paris', 'PARIS', 'Par', 'Lyon', 'lyon', 'Nice', 'Ni',
+    'Москва', 'москва', 'МОСКВА', 'Моск', 'Казань', 'казань', 'Омск',
+)
+
+
+class BaselineGrader:
+
+    def __init__(self, question, variants, empty_answers):
+        self.question = question
+        self.variants = variants
+        self.empty_answers = empty_answers
+        self.records = []
+
+        if self.question.text_answer:
+            value = 'text'
+        else:
+            value = 'id'
+
+        self.corrected = [
+            getattr(variant, value) for variant in variants if variant.correct
+        ]
+
+    def clean(self, cleaned_data):
+        v_count = [v for v in cleaned_data.values() if v is False]
+
+        return not (
+            self.question.many_correct
+            and len(v_count) == len(cleaned_data.keys())
+            and self.empty_answers is False
+        )
+
+    def add_results(self, results, correct, no_answers=False):
+        for_create = []
+
+        for variant in self.variants:
+            selected = False
+            corrected = False
+
+            if self.question.text_answer:
+                if results[0].lower() in variant.text.lower():
+                    selected = True
+
+                if variant.text in self.corrected:
+                    corrected = True
+            else:
+                if variant.id in results:
+                    selected = True
+
+                if variant.id in self.corrected:
+                    corrected = True
+
+            for_create.append((variant.id, variant.text, selected, corrected))
+
+        typed = None
+        if self.question.text_answer and correct is False:
+            typed = results[0]
+
+        self.records.append((correct, no_answers, tuple(for_create), typed))
+
+    def answer_with_one_correct(self, cleaned_data):
+        correct = True
+        result = [int(cleaned_data.get('result'))]
+        variant = [
+            variant for variant in self.variants
+            if variant.id == result[0] and variant.correct
+        ]
+
+        if not variant:
+            correct = False
+
+        if result:
+            self.add_results(result, correct)
+
+    def answer_with_many_correct(self, cleaned_data):
+        correct = True
+        results = []
+
+        for variant_id in cleaned_data:
+            status = cleaned_data.get(variant_id)
+            if status is True:
+                results.append(int(variant_id))
+
+        if self.empty_answers and not results:
+            variants = [
+                variant for variant in self.variants if variant.correct]
+            if variants:
+                correct = False
+            self.add_results(results, correct, no_answers=True)
+
+        uncorrects = [
+            variant for variant in self.variants
+            if variant.id in results and not variant.correct
+        ]
+        corrects_count = len(
+            [variant for variant in self.variants if variant.correct])
+
+        if uncorrects or len(results) < corrects_count:
+            correct = False
+
+        if results:
+            self.add_results(results, correct)
+
+    def answer_with_text_answer(self, cleaned_data):
+        correct = True
+        answer = [cleaned_data.get('answer')]
+        variant = [
+            variant for variant in self.variants
+            if variant.text.lower() == answer[0].lower() and variant.correct
+        ]
+
+        if not variant:
+            correct = False
+
+        if answer:
+            self.add_results(answer, correct)
+
+    def grade(self, cleaned_data):
+        if not self.clean(cleaned_data):
+            return None
+
+        if self.question.one_correct:
+            self.answer_with_one_correct(cleaned_data)
+        elif self.question.many_correct:
+            self.answer_with_many_correct(cleaned_data)
+        else:
+            self.answer_with_text_answer(cleaned_data)
+        return self.records
+
+
+def make_question(random, question_id):
+    question_type = random.choice([choice for choice, _ in Question.TYPES])
+    variants = tuple(
+        VariantSnapshot(
+            id=question_id * 10 + number,
+            text=random.choice(WORDS),
+            correct=random.random() < 0.4
+        )
+        for number in range(random.randint(1, 5))
+    )
+    return QuestionSnapshot(
+        id=question_id,
+        type=question_type,
+        text=f'Вопрос {question_id}',
+        description=None,
+        success_message=None,
+        variants=variants,
+        correct_ids=frozenset(
+            variant.id for variant in variants if variant.correct),
+        correct_texts=frozenset(
+            variant.text for variant in variants if variant.correct)
+    )
+
+
+def make_data(random, question):
+    if question.one_correct:
+        return {'result': str(random.choice(question.variants).id)}
+
+    if question.many_correct:
+        chance = random.choice((0, 0.3, 0.7, 1))
+        return {
+            str(variant.id): 'on'
+            for variant in question.variants if random.random() < chance
+        }
+
+    word = random.choice(WORDS + tuple(
+        variant.text for variant in question.variants))
+    if random.random() < 0.3:
+        word = word[:random.randint(1, len(word))]
+    return {'answer': random.choice((word, word.lower(), word.upper()))}
+
+
+def to_records(result):
+    variants = tuple(
+        (variant.variant_id, variant.text, variant.selected, variant.correct)
+        for variant in result.variants
+    )
+    typed = None if result.correct else result.text
+    return [(result.correct, result.no_answers, variants, typed)]
+
+
+def make_form(question, data, empty_answers):
+    exam = SimpleNamespace(shuffle_variants=False, empty_answers=empty_answers)
+    return ExamProcessForm(data, initial={
+        'exam': exam,
+        'question': question,
+        'progress': None,
+        'user': None,
+        'variants': question.variants
+    })
+
+
+class GradingParityTest(SimpleTestCase):
+
+    def assert_parity(self, question, data, empty_answers):
+        form = make_form(question, data, empty_answers)
+        actual = to_records(form.grade()) if form.is_valid() else None
+        expected = BaselineGrader(
+            question, question.variants, empty_answers
+        ).grade(form.cleaned_data)
+
+        with self.subTest(question=question, data=data,
+                          empty_answers=empty_answers):
+            self.assertEqual(actual, expected)
+        return expected
+
+    def test_matches_baseline_grading(self):
+        random = Random(20240401)
+        checked = set()
+
+        for question_id in range(1, CASES_COUNT + 1):
+            question = make_question(random, question_id)
+            empty_answers = random.random() < 0.5
+            expected = self.assert_parity(
+                question, make_data(random, question), empty_answers)
+            checked.add((question.type, empty_answers, expected is None))
+
+        self.assertIn((Question.MANY_CORRECT, True, False), checked)
+        self.assertIn((Question.MANY_CORRECT, False, True), checked)
+
+    def test_many_correct_without_selection(self):
+        variants = (
+            VariantSnapshot(id=1, text='Paris', correct=True),
+            VariantSnapshot(id=2, text='Lyon', correct=False),
+        )
+        question = QuestionSnapshot(
+            id=1, type=Question.MANY_CORRECT, text='Вопрос',
+            description=None, success_message=None, variants=variants,
+            correct_ids=frozenset({1}), correct_texts=frozenset({'Paris'})
+        )
+
+        self.assertIsNone(self.assert_parity(question, {}, False))
+        self.assertEqual(
+            self.assert_parity(question, {}, True),
+            [(False, True, ((1, 'Paris', False, True),
+                            (2, 'Lyon', False, False)), None)]
+        )
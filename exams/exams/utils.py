@@ -1,3 +1,8 @@
+from random import Random, randrange
+
+from slugify import slugify
+
+
 def get_humanize_time(minutes):
     if minutes < 60:
         humanize_time = f'{minutes} мин.'
@@ -5,3 +10,15 @@ def get_humanize_time(minutes):
         str_ = '{:02d} ч. {:02d} мин.'
         humanize_time = str_.format(*divmod(minutes, 60))
     return humanize_time
+
+
+def seeded_shuffle(items, *seed):
+    shuffled = list(items)
+    Random(':'.join(str(part) for part in seed)).shuffle(shuffled)
+    return shuffled
+
+
+def make_slug(title: str, code: object = None) -> str:
+    if code is None:
+        code = randrange(10000, 99999)
+    return slugify(title) + '-' + str(code)
@@ -1,22 +1,40 @@
+from functools import partial
+
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import (Count, ExpressionWrapper, F, IntegerField,
-                              Prefetch, Q)
-from django.db.models.functions.comparison import NullIf
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.views.generic import DetailView, FormView, ListView
-from progress.models import Progress, UserAnswer, UserVariant
+
+from core.budgets import query_budget
+from core.cache import get_versions
+from core.routers import read_only
+from core.views import AnonymousPageCacheMixin, make_etag
+from progress.models import Progress, UserAnswer
+from progress.results import build_result
+from users.models import Ranking
 
 from .forms import ExamProcessForm
-from .models import Category, Exam, Question, Variant
-from .utils import get_humanize_time
+from .models import Category, Exam, ExamStats, QuestionStats
+from .pages import ATTEMPTS_PAGES, CATALOG_PAGES, EXAM_PAGES
+from .signals import attempt_finished
+from .snapshots import get_exam_snapshot
+from .stats import get_category_counts, get_exam_stats
+from .utils import get_humanize_time, seeded_shuffle
 
 
-class IndexView(ListView):
+@query_budget(6)
+@read_only
+class IndexView(AnonymousPageCacheMixin, ListView):
     model = Category
+    page_versions = (CATALOG_PAGES, ATTEMPTS_PAGES)
     template_name = 'exams/index.html'
     context_object_name = 'categories'
-    queryset = Category.objects.exams_count()
+
+    def get_queryset(self):
+        return get_category_counts()
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -33,8 +51,11 @@ class IndexView(ListView):
         return context
 
 
-class ExamListView(ListView):
+@query_budget(8)
+@read_only
+class ExamListView(AnonymousPageCacheMixin, ListView):
     model = Exam
+    page_versions = (CATALOG_PAGES, ATTEMPTS_PAGES)
     template_name = 'exams/exam_list.html'
     context_object_name = 'exams'
     paginate_by = 18
@@ -47,8 +68,7 @@ class ExamListView(ListView):
             category = get_object_or_404(Category, slug=slug)
             context.update({'category': category})
 
-        categories = Category.objects.exams_count()
-        context.update({'categories': categories})
+        context.update({'categories': get_category_counts()})
         return context
 
     def get_queryset(self):
@@ -67,19 +87,41 @@ class ExamListView(ListView):
         return queryset
 
 
-class ExamDetailView(DetailView):
+def exam_etag(request: object, slug: str) -> str:
+    versions = get_versions((CATALOG_PAGES, EXAM_PAGES.format(slug)))
+    user = request.user
+    progress = None
+
+    if user.is_authenticated:
+        progress = (
+            Progress.objects
+            .filter(user=user, exam__slug=slug, latest__isnull=False)
+            .values_list('id', 'stage', 'finished')
+            .first()
+        )
+    return make_etag(
+        sorted(versions.items()), user.pk, user.get_username(), progress)
+
+
+@query_budget(6)
+@read_only
+@method_decorator(condition(etag_func=exam_etag), name='dispatch')
+class ExamDetailView(AnonymousPageCacheMixin, DetailView):
     model = Exam
     template_name = 'exams/exam_detail.html'
 
+    def get_page_versions(self):
+        return CATALOG_PAGES, EXAM_PAGES.format(self.kwargs.get('slug'))
+
     def get_object(self, *args, **kwargs):
         slug = self.kwargs.get('slug')
-        exam = (
-            Exam.objects
-            .select_related('category')
-            .users_stats()
-            .questions_count()
+        exam = get_object_or_404(
+            Exam.objects.select_related('category'),
+            slug=slug, active=True, visibility=True
         )
-        return get_object_or_404(exam, slug=slug, active=True, visibility=True)
+        for field, value in (get_exam_stats(exam.id) or {}).items():
+            setattr(exam, field, value)
+        return exam
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -90,10 +132,10 @@ class ExamDetailView(DetailView):
                 Exam.objects
                 .filter(
                     slug=slug, progress__user=self.request.user,
+                    progress__latest__isnull=False,
                     active=True, visibility=True
                 )
                 .with_request_user_progress()
-                .order_by('-started')
                 .first()
             )
             context.update({'progress': progress})
@@ -103,6 +145,7 @@ class ExamDetailView(DetailView):
         return context
 
 
+@query_budget(18)
 class ExamProcessView(LoginRequiredMixin, FormView):
     template_name = 'exams/exam_process.html'
     form_class = ExamProcessForm
@@ -110,9 +153,15 @@ class ExamProcessView(LoginRequiredMixin, FormView):
     def get_or_create_progress(self):
         progress = (
             Progress.objects
-            .filter(user=self.request.user, exam__slug=self.slug)
-            .order_by('-started')
-            .get_percentage()
+            .filter(
+                user=self.request.user, exam__slug=self.slug,
+                latest__isnull=False
+            )
+            .select_related('exam')
+            .only(
+                'user', 'stage', 'answers_quantity', 'started', 'finished',
+                'exam__id', 'exam__revision'
+            )
             .first()
         )
         restart = self.request.GET.get('restart')
@@ -127,14 +176,34 @@ class ExamProcessView(LoginRequiredMixin, FormView):
                     exam=exam,
                     exam_revision=exam.revision
                 )
+                ExamStats.objects.add_attempt(exam.id)
         return progress
 
     def get_remaining_time(self):
-        time_to_pass = self.question.exam.timer * 60
+        time_to_pass = self.exam.timer * 60
         current = (timezone.now() - self.progress.started).total_seconds()
         remaining_time = int(time_to_pass - current)
         return remaining_time
 
+    def get_stages(self):
+        answers = dict(
+            UserAnswer.objects
+            .filter(progress=self.progress)
+            .values_list('question_id', 'correct')
+        )
+        stages = [
+            {
+                'answered': question.id in answers,
+                'correct': answers.get(question.id)
+            }
+            for question in self.exam.questions
+        ]
+        return stages
+
+    def get_global_correct_percentage(self):
+        percentages = QuestionStats.objects.percentages([self.question.id])
+        return percentages.get(self.question.id)
+
     def dispatch(self, request, *args, **kwargs):
         if not self.request.user.is_authenticated:
             return redirect('users:signup')
@@ -142,48 +211,20 @@ class ExamProcessView(LoginRequiredMixin, FormView):
         self.slug = self.kwargs.get('slug')
         self.stage = self.kwargs.get('pk')
         self.progress = self.get_or_create_progress()
+        self.exam = get_exam_snapshot(self.progress.exam)
 
-        self.questions_queue = (
-            Question.objects
-            .filter(
-                active=True, visibility=True,
-            )
-            .annotate(
-                global_correct_percentage=ExpressionWrapper(
-                    NullIf(Count('answers', distinct=True, filter=Q(
-                        answers__correct=True
-                    )), 0) * 100
-                    / NullIf(Count('answers', distinct=True), 0),
-                    output_field=IntegerField()
-                )
-            )
-            .filter(exam__slug=self.slug)
-            .annotate(
-                corrected=Count('answers__correct', filter=Q(
-                    answers__progress=self.progress,
-                    answers__correct=True
-                )),
-                finished=Count('answers__date', filter=Q(
-                    answers__progress=self.progress,
-                    answers__date__isnull=False
-                ))
-            )
-            .select_related('exam', 'exam__category')
-            .order_by('priority', 'id')
-        )
-
-        if len(self.questions_queue) < self.stage:
+        if len(self.exam.questions) < self.stage:
             return redirect('exams:exam_detail', self.slug)
 
-        self.question = self.questions_queue[self.stage - 1]
-        self.last_stage = len(self.questions_queue) == self.stage
+        self.question = self.exam.questions[self.stage - 1]
+        self.last_stage = len(self.exam.questions) == self.stage
         self.answered = self.stage < self.progress.stage
         return super(ExamProcessView, self).dispatch(request, *args, **kwargs)
 
     def get(self, request, *args, **kwargs):
         if (
             self.stage > self.progress.stage
-            or not self.question.exam.show_results
+            or not self.exam.show_results
             and self.stage != self.progress.stage
         ):
             return redirect(
@@ -196,9 +237,9 @@ class ExamProcessView(LoginRequiredMixin, FormView):
     def get_initial(self):
         initial = super().get_initial()
         if self.answered is False:
-            self.variants = Variant.objects.filter(question=self.question)
-            initial['variants'] = self.variants
+            initial['variants'] = self.question.variants
         self.initial_data = {
+            'exam': self.exam,
             'question': self.question,
             'answered': self.answered,
             'progress': self.progress,
@@ -211,92 +252,93 @@ class ExamProcessView(LoginRequiredMixin, FormView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        if self.question.exam.show_results and self.answered:
-            filter_data = {
-                'answer': F('answer')
-            }
-            if self.question.text_answer:
-                filter_data['selected'] = True
-
+        if self.exam.show_results and self.answered:
             answer = (
                 UserAnswer.objects
-                .prefetch_related(Prefetch('variants', queryset=(
-                    UserVariant.objects
-                    .filter(**filter_data)
-                    .order_by('-selected', '?')
-                )))
                 .filter(
                     progress=self.progress,
-                    question=self.question,
+                    question_id=self.question.id,
                 )
                 .get_counters()
                 .order_by('date')
                 .first()
             )
+            if answer:
+                variants = self.question.variants
+                if self.exam.shuffle_variants:
+                    variants = seeded_shuffle(
+                        variants, self.progress.id, self.question.id)
+                answer.variants = answer.get_variants(
+                    variants, selected_only=self.question.text_answer)
             extra_context = {
                 'answer': answer,
+                'global_correct_percentage': (
+                    self.get_global_correct_percentage()),
                 'last_stage': self.last_stage,
                 'next_stage': self.stage + 1
             }
             context.update(extra_context)
 
-        if self.question.exam.timer:
+        if self.exam.timer:
             context['remaining_time'] = self.get_remaining_time()
-            context['humanize_time'] = get_humanize_time(
-                self.question.exam.timer)
+            context['humanize_time'] = get_humanize_time(self.exam.timer)
 
-        context['questions'] = self.questions_queue
+        context['stages'] = self.get_stages()
         context.update(self.initial_data)
         return context
 
-    def form_valid(self, form):
-        data = {
-            'stage': self.stage + 1,
-            'answers_quantity': self.stage
+    def finish_progress(self):
+        result = build_result(self.progress.id)
+        update = {
+            'finished': timezone.now(),
+            'passed': True,
+            'result': result
         }
 
-        if self.progress.stage < self.stage + 1:
-            Progress.objects.filter(id=self.progress.id).update(**data)
+        if self.exam.timer and self.get_remaining_time() < 0:
+            update['passed'] = False
 
-            match True:
-                case self.question.many_correct:
-                    form.answer_with_many_correct()
-                case self.question.one_correct:
-                    form.answer_with_one_correct()
-                case self.question.text_answer:
-                    form.answer_with_text_answer()
+        try:
+            if (
+                self.exam.required_percent
+                and self.exam.required_percent > result['correct_percentage']
+            ):
+                update['passed'] = False
+        except TypeError:
+            update['passed'] = False
 
-        if self.last_stage:
-            update = {
-                'finished': timezone.now(),
-                'passed': True
-            }
-            actual_progress = (
+        with transaction.atomic():
+            finished = (
                 Progress.objects
-                .filter(id=self.progress.id)
-                .get_percentage()
+                .filter(id=self.progress.id, finished__isnull=True)
+                .update(**update)
             )
+            if finished:
+                ExamStats.objects.add_finished(
+                    self.progress, update['passed'])
+                transaction.on_commit(partial(
+                    Ranking.objects.refresh_user, self.progress.user_id))
+                attempt_finished.send(
+                    sender=Progress, progress=self.progress, exam=self.exam)
 
-            if self.question.exam.timer and self.get_remaining_time() < 0:
-                update['passed'] = False
-
-            try:
-                if (
-                    self.question.exam.required_percent
-                    and self.question.exam.required_percent
-                    > actual_progress.first().correct_percentage
-                ):
-                    update['passed'] = False
-            except TypeError:
-                update['passed'] = False
+    def form_valid(self, form):
+        data = {
+            'stage': self.stage + 1,
+            'answers_quantity': self.stage
+        }
 
-            actual_progress.update(**update)
+        if self.progress.stage < self.stage + 1:
+            with transaction.atomic():
+                Progress.objects.filter(id=self.progress.id).update(**data)
+                form.save()
 
+        if self.last_stage:
+            if not self.progress.finished:
+                self.finish_progress()
             return redirect('progress:progress_detail', pk=self.progress.id)
 
-        elif self.question.exam.show_results:
+        if self.exam.show_results:
             return redirect(
                 'exams:exam_process', slug=self.slug, pk=self.stage)
-        else:
-            return redirect(
-                'exams:exam_process', slug=self.slug, pk=self.stage + 1)
+        return redirect(
+            'exams:exam_process', slug=self.slug, pk=self.stage + 1)
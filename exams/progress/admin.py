@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Progress
+from .models import ArchivedProgress, LatestProgress, Progress
 
 
 class ProgressAdmin(admin.ModelAdmin):
@@ -18,5 +18,27 @@ class ProgressAdmin(admin.ModelAdmin):
 
     current_stage.short_description = 'Этап'
 
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        LatestProgress.objects.refresh({(obj.user_id, obj.exam_id)})
+
+    def delete_queryset(self, request, queryset):
+        pairs = set(queryset.values_list('user_id', 'exam_id'))
+        super().delete_queryset(request, queryset)
+        LatestProgress.objects.refresh(pairs)
+
+
+class ArchivedProgressAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'exam', 'exam_revision', 'answers_count',
+                    'correct_count', 'passed', 'started', 'finished')
+    exclude = ('result',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 admin.site.register(Progress, ProgressAdmin)
+admin.site.register(ArchivedProgress, ArchivedProgressAdmin)
@@ -0,0 +1,95 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from exams.models import QuestionStats
+
+from .models import ArchivedProgress, Progress, UserAnswer
+from .results import build_result
+
+
+def get_archivable(cutoff: object) -> object:
+    newer = Progress.objects.filter(
+        user=OuterRef('user'),
+        exam=OuterRef('exam'),
+        finished__isnull=False,
+        started__gt=OuterRef('started')
+    )
+    archivable = (
+        Progress.objects
+        .filter(Exists(newer), finished__lt=cutoff)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    return archivable
+
+
+def count_answers(progress_ids: list) -> tuple:
+    answers = (
+        UserAnswer.objects
+        .filter(progress_id__in=progress_ids)
+        .order_by()
+        .values('progress_id', 'question_id')
+        .annotate(
+            total=Count('id'),
+            correct=Count('id', filter=Q(correct=True))
+        )
+    )
+    by_progress = Counter()
+    by_question = Counter()
+
+    for row in answers:
+        by_progress[row['progress_id'], 'total'] += row['total']
+        by_progress[row['progress_id'], 'correct'] += row['correct']
+        if row['question_id'] is not None:
+            by_question[row['question_id'], 'total'] += row['total']
+            by_question[row['question_id'], 'correct'] += row['correct']
+    return by_progress, by_question
+
+
+@transaction.atomic
+def archive_chunk(progress_ids: list) -> int:
+    progression = list(
+        Progress.objects
+        .select_for_update()
+        .filter(id__in=progress_ids, finished__isnull=False)
+    )
+    progress_ids = [progress.id for progress in progression]
+    by_progress, by_question = count_answers(progress_ids)
+
+    ArchivedProgress.objects.bulk_create([
+        ArchivedProgress(
+            id=progress.id,
+            user_id=progress.user_id,
+            exam_id=progress.exam_id,
+            exam_revision=progress.exam_revision,
+            started=progress.started,
+            finished=progress.finished,
+            passed=progress.passed,
+            answers_count=by_progress[progress.id, 'total'],
+            correct_count=by_progress[progress.id, 'correct'],
+            result=progress.result or build_result(progress.id)
+        )
+        for progress in progression
+    ])
+
+    for question_id in {question_id for question_id, _ in by_question}:
+        QuestionStats.objects.increment(
+            question_id,
+            archived_answers_count=by_question[question_id, 'total'],
+            archived_correct_count=by_question[question_id, 'correct']
+        )
+
+    Progress.objects.filter(id__in=progress_ids).delete()
+    return len(progress_ids)
+
+
+def archive_progress(cutoff: object, chunk_size: int = 500) -> object:
+    archivable = get_archivable(cutoff)
+
+    while True:
+        progress_ids = list(archivable[:chunk_size])
+        if not progress_ids:
+            return
+        yield archive_chunk(progress_ids)
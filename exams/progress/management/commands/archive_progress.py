@@ -0,0 +1,30 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from progress.archive import archive_progress
+
+
+class Command(BaseCommand):
+    help = ('Переносит в архив завершенные попытки старше заданного срока, '
+            'если у пользователя есть более поздняя завершенная попытка '
+            'того же теста')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=settings.PROGRESS_ARCHIVE_DAYS,
+            help='Архивировать попытки, завершенные столько дней назад')
+        parser.add_argument('--chunk-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        count = 0
+
+        for archived in archive_progress(cutoff, options['chunk_size']):
+            count += archived
+            self.stdout.write(f'Архивировано попыток: {count}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено в архив {count} попыток'))
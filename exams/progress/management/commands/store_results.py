@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from progress.models import Progress
+from progress.results import store_result
+
+
+class Command(BaseCommand):
+    help = ('Сохраняет итоги завершенных попыток, пройденных до появления '
+            'сохраненных итогов')
+
+    def handle(self, *args, **options):
+        progress_ids = (
+            Progress.objects
+            .filter(finished__isnull=False, result__isnull=True)
+            .values_list('id', flat=True)
+            .iterator()
+        )
+        count = 0
+
+        for progress_id in progress_ids:
+            store_result(progress_id)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Сохранены итоги {count} попыток'))
@@ -1,7 +1,13 @@
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import transaction
 from django.db.models import (Count, ExpressionWrapper, F, IntegerField,
-                              Manager, Prefetch, Q, QuerySet)
+                              Manager, OuterRef, Q, QuerySet, Subquery)
 from django.db.models.functions.comparison import NullIf
 
+from exams.utils import seeded_shuffle
+
 
 class UserAnswerQuerySet(QuerySet):
 
@@ -9,20 +15,34 @@ class UserAnswerQuerySet(QuerySet):
         counters = (
             self
             .annotate(
-                corrected_count=Count('variants', filter=Q(
-                    variants__correct=True,
-                    variants__selected=True
-                )),
-                selected_count=Count('variants', filter=Q(
-                    variants__selected=True
-                )),
                 question_text=F('question__text'),
                 question_type=F('question__type'),
                 exam_show_correct=F('question__exam__show_correct'),
+                exam_shuffle_variants=F('question__exam__shuffle_variants'),
             )
         )
         return counters
 
+    def load_variants(self, selected_only: bool = False) -> list:
+        answers = list(self)
+        variants = defaultdict(list)
+        question_variants = (
+            apps.get_model('exams', 'Variant').objects
+            .filter(question_id__in={answer.question_id for answer in answers})
+            .only('question_id', 'text')
+        )
+
+        for variant in question_variants:
+            variants[variant.question_id].append(variant)
+
+        for answer in answers:
+            ordered = variants[answer.question_id]
+            if answer.exam_shuffle_variants:
+                ordered = seeded_shuffle(
+                    ordered, answer.progress_id, answer.question_id)
+            answer.variants = answer.get_variants(ordered, selected_only)
+        return answers
+
 
 class UserAnswerManager(Manager):
 
@@ -32,6 +52,9 @@ class UserAnswerManager(Manager):
     def get_counters(self) -> object:
         return self.get_queryset().get_counters()
 
+    def load_variants(self, selected_only: bool = False) -> list:
+        return self.get_queryset().load_variants(selected_only)
+
 
 class ProgressQuerySet(QuerySet):
 
@@ -51,24 +74,10 @@ class ProgressQuerySet(QuerySet):
         )
         return percentage
 
-    def get_details(self, answers: object, variants: object) -> object:
+    def get_details(self) -> object:
         details = (
             self
             .select_related('user', 'exam', 'exam__category')
-            .prefetch_related(
-                Prefetch(
-                    'answers', queryset=answers.objects
-                    .filter(progress=F('progress'))
-                    .defer('question', 'date')
-                    .get_counters()
-                    .order_by('date')
-                ),
-                Prefetch(
-                    'answers__variants', queryset=variants.objects
-                    .filter(answer=F('answer'))
-                    .defer('variant')
-                    .order_by('-selected', '?')
-                ))
             .only('user__username', 'exam__title', 'exam__show_results',
                   'exam__success_message', 'exam__category__title',
                   'exam__category__slug')
@@ -96,5 +105,51 @@ class ProgressManager(Manager):
     def get_percentage(self):
         return self.get_queryset().get_percentage()
 
-    def get_details(self, answers: object, variants: object) -> object:
+    def get_details(self) -> object:
         return self.get_queryset().get_details()
+
+
+class LatestProgressManager(Manager):
+
+    def point(self, progress: object) -> None:
+        self.update_or_create(
+            user_id=progress.user_id,
+            exam_id=progress.exam_id,
+            defaults={'progress_id': progress.id}
+        )
+
+    def refresh(self, pairs: set = None) -> int:
+        progress_model = apps.get_model('progress', 'Progress')
+        selected = Q()
+        if pairs is not None:
+            selected = Q(pk__in=[])
+            for user_id, exam_id in pairs:
+                selected |= Q(user_id=user_id, exam_id=exam_id)
+
+        latest = (
+            progress_model.objects
+            .filter(user=OuterRef('user'), exam=OuterRef('exam'))
+            .order_by('-started', '-id')
+            .values('id')[:1]
+        )
+        rows = (
+            progress_model.objects
+            .filter(selected)
+            .order_by()
+            .values('user', 'exam')
+            .distinct()
+            .annotate(progress=Subquery(latest))
+        )
+        pointers = [
+            self.model(
+                user_id=row['user'],
+                exam_id=row['exam'],
+                progress_id=row['progress']
+            )
+            for row in rows
+        ]
+
+        with transaction.atomic():
+            self.filter(selected).delete()
+            self.bulk_create(pointers, batch_size=1000)
+        return len(pointers)
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0002_progress_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='progress',
+            name='result',
+            field=models.JSONField(blank=True, editable=False, null=True, verbose_name='Итоги'),
+        ),
+    ]
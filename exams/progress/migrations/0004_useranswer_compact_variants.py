@@ -0,0 +1,204 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:07
+
+from collections import defaultdict
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def store_results(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Progress = apps.get_model('progress', 'Progress')
+    UserAnswer = apps.get_model('progress', 'UserAnswer')
+    UserVariant = apps.get_model('progress', 'UserVariant')
+    finished_ids = list(
+        Progress.objects.using(db_alias)
+        .filter(finished__isnull=False, result__isnull=True)
+        .order_by('id')
+        .values_list('id', flat=True)
+    )
+    for start in range(0, len(finished_ids), 500):
+        progress_ids = finished_ids[start:start + 500]
+        progression = list(
+            Progress.objects.using(db_alias)
+            .filter(id__in=progress_ids)
+            .annotate(
+                questions_count=Count(
+                    'exam__questions', distinct=True, filter=Q(
+                        exam__questions__visibility=True,
+                        exam__questions__active=True
+                    )),
+                correct_count=Count('answers', distinct=True, filter=Q(
+                    answers__correct=True
+                ))
+            )
+            .only('id')
+        )
+        variants = defaultdict(list)
+        rows = (
+            UserVariant.objects.using(db_alias)
+            .filter(answer__progress_id__in=progress_ids)
+            .order_by('answer_id', '-selected', 'id')
+            .values_list('answer_id', 'variant_text', 'selected', 'correct')
+        )
+        for answer_id, text, selected, correct in rows:
+            variants[answer_id].append({
+                'variant_text': text,
+                'selected': selected,
+                'correct': correct
+            })
+
+        answers = defaultdict(list)
+        rows = (
+            UserAnswer.objects.using(db_alias)
+            .filter(progress_id__in=progress_ids)
+            .order_by('progress_id', 'date', 'id')
+            .values('id', 'progress_id', 'correct', 'no_answers',
+                    'question__text', 'question__type',
+                    'question__exam__show_correct')
+        )
+        for row in rows:
+            answer_variants = variants[row['id']]
+            answers[row['progress_id']].append({
+                'question_text': row['question__text'],
+                'question_type': row['question__type'],
+                'exam_show_correct': row['question__exam__show_correct'],
+                'correct': row['correct'],
+                'no_answers': row['no_answers'],
+                'selected_count': sum(
+                    variant['selected'] for variant in answer_variants),
+                'corrected_count': sum(
+                    variant['selected'] and variant['correct']
+                    for variant in answer_variants),
+                'variants': answer_variants
+            })
+
+        for progress in progression:
+            percentage = None
+            if progress.correct_count and progress.questions_count:
+                percentage = (
+                    progress.correct_count * 100 // progress.questions_count)
+            progress.result = {
+                'questions_count': progress.questions_count,
+                'correct_count': progress.correct_count,
+                'correct_percentage': percentage,
+                'answers': answers[progress.id]
+            }
+        Progress.objects.using(db_alias).bulk_update(progression, ['result'])
+
+
+def get_typed_text(variants: list) -> str:
+    _, variant_id, text, selected, correct, answered, question_type = (
+        variants[-1])
+    if (
+        question_type == 'text_answer'
+        and answered is False
+        and variant_id is None
+        and selected
+        and not correct
+    ):
+        return text
+    return None
+
+
+def compact_variants(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    UserAnswer = apps.get_model('progress', 'UserAnswer')
+    UserVariant = apps.get_model('progress', 'UserVariant')
+    rows = (
+        UserVariant.objects.using(db_alias)
+        .order_by('answer_id', 'id')
+        .values_list('answer_id', 'variant_id', 'variant_text', 'selected',
+                     'correct', 'answer__correct', 'answer__question__type')
+        .iterator(chunk_size=10000)
+    )
+    answers = []
+    for answer_id, variants in groupby(rows, key=itemgetter(0)):
+        variants = list(variants)
+        answer = UserAnswer(
+            id=answer_id,
+            selected_ids=[],
+            correct_ids=[],
+            text=get_typed_text(variants)
+        )
+        for _, variant_id, _, selected, correct, _, _ in variants:
+            if variant_id is None:
+                continue
+            if selected:
+                answer.selected_ids.append(variant_id)
+            if correct:
+                answer.correct_ids.append(variant_id)
+        answers.append(answer)
+        if len(answers) >= 1000:
+            UserAnswer.objects.using(db_alias).bulk_update(
+                answers, ['selected_ids', 'correct_ids', 'text'])
+            answers = []
+    UserAnswer.objects.using(db_alias).bulk_update(
+        answers, ['selected_ids', 'correct_ids', 'text'])
+
+
+def expand_variants(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    UserAnswer = apps.get_model('progress', 'UserAnswer')
+    UserVariant = apps.get_model('progress', 'UserVariant')
+    Variant = apps.get_model('exams', 'Variant')
+    answers = (
+        UserAnswer.objects.using(db_alias)
+        .filter(question__isnull=False)
+        .iterator()
+    )
+    rows = []
+    for answer in answers:
+        selected_ids = set(answer.selected_ids)
+        correct_ids = set(answer.correct_ids)
+        for variant in Variant.objects.using(db_alias).filter(
+                question_id=answer.question_id):
+            rows.append(UserVariant(
+                answer_id=answer.id,
+                variant_id=variant.id,
+                variant_text=variant.text,
+                selected=variant.id in selected_ids,
+                correct=variant.id in correct_ids
+            ))
+        if answer.text is not None and not answer.correct:
+            rows.append(UserVariant(
+                answer_id=answer.id,
+                variant_text=answer.text,
+                selected=True
+            ))
+        if len(rows) >= 1000:
+            UserVariant.objects.using(db_alias).bulk_create(rows)
+            rows = []
+    UserVariant.objects.using(db_alias).bulk_create(rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0003_progress_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='useranswer',
+            name='correct_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='Верные варианты'),
+        ),
+        migrations.AddField(
+            model_name='useranswer',
+            name='selected_ids',
+            field=models.JSONField(blank=True, default=list, verbose_name='Выбранные варианты'),
+        ),
+        migrations.AddField(
+            model_name='useranswer',
+            name='text',
+            field=models.TextField(blank=True, null=True, verbose_name='Текст ответа'),
+        ),
+        migrations.RunPython(store_results, migrations.RunPython.noop),
+        migrations.RunPython(compact_variants, expand_variants),
+        migrations.DeleteModel(
+            name='UserVariant',
+        ),
+    ]
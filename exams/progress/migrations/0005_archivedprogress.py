@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('exams', '0012_questionstats_archived'),
+        ('progress', '0004_useranswer_compact_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedProgress',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False, verbose_name='Номер попытки')),
+                ('exam_revision', models.DateTimeField(blank=True, null=True, verbose_name='Редакция тестирования')),
+                ('started', models.DateTimeField(null=True, verbose_name='Дата начала')),
+                ('finished', models.DateTimeField(verbose_name='Дата завершения')),
+                ('passed', models.BooleanField(null=True, verbose_name='Зачтено')),
+                ('answers_count', models.PositiveIntegerField(default=0, verbose_name='Ответов')),
+                ('correct_count', models.PositiveIntegerField(default=0, verbose_name='Верных ответов')),
+                ('result', models.JSONField(verbose_name='Итоги')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_progress', to='exams.exam', verbose_name='Тестирование')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_progression', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Архивная попытка',
+                'verbose_name_plural': 'Архив попыток',
+            },
+        ),
+    ]
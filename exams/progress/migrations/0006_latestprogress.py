@@ -0,0 +1,66 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:13
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+import django.db.models.deletion
+
+
+def fill_latest(apps, schema_editor):
+    db_alias = schema_editor.connection.alias
+    Progress = apps.get_model('progress', 'Progress')
+    LatestProgress = apps.get_model('progress', 'LatestProgress')
+    latest = (
+        Progress.objects.using(db_alias)
+        .filter(user=OuterRef('user'), exam=OuterRef('exam'))
+        .order_by('-started', '-id')
+        .values('id')[:1]
+    )
+    rows = (
+        Progress.objects.using(db_alias)
+        .order_by()
+        .values('user', 'exam')
+        .distinct()
+        .annotate(progress=Subquery(latest))
+    )
+    LatestProgress.objects.using(db_alias).bulk_create(
+        [
+            LatestProgress(
+                user_id=row['user'],
+                exam_id=row['exam'],
+                progress_id=row['progress']
+            )
+            for row in rows.iterator()
+        ],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0012_questionstats_archived'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('progress', '0005_archivedprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatestProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latest_progress', to='exams.exam', verbose_name='Тестирование')),
+                ('progress', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='latest', to='progress.progress', verbose_name='Последняя попытка')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='latest_progression', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Последняя попытка пользователя',
+                'verbose_name_plural': 'Последние попытки пользователей',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='latestprogress',
+            constraint=models.UniqueConstraint(fields=('user', 'exam'), name='progress_latest_user_exam_uniq'),
+        ),
+        migrations.RunPython(fill_latest, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.16 on 2026-10-18 05:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from core.operations import AddIndexConcurrently, AlterFieldIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('progress', '0006_latestprogress'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='progress',
+            index=models.Index(fields=['user', 'exam', '-started'], name='progress_user_exam_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='progress',
+            index=models.Index(fields=['finished'], name='progress_finished_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='useranswer',
+            index=models.Index(fields=['progress', 'question', 'date'], name='progress_answer_question_idx'),
+        ),
+        AlterFieldIndexConcurrently(
+            model_name='progress',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='progression', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь'),
+        ),
+        AlterFieldIndexConcurrently(
+            model_name='useranswer',
+            name='progress',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='answers', to='progress.progress', verbose_name='Прогресс'),
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils import timezone
 
-from exams.models import Exam, Question, Variant
+from exams.models import Exam, Question
 from users.models import User
 
 from . import managers
@@ -12,7 +12,8 @@ class Progress(models.Model):
         User,
         verbose_name='Пользователь',
         related_name='progression',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
     exam = models.ForeignKey(
         Exam,
@@ -45,20 +46,123 @@ class Progress(models.Model):
         verbose_name='Зачтено',
         null=True
     )
+    result = models.JSONField(
+        verbose_name='Итоги',
+        null=True,
+        blank=True,
+        editable=False
+    )
 
     objects = managers.ProgressManager()
 
     class Meta:
         verbose_name = 'Прогресс пользователя'
         verbose_name_plural = 'Прогресс пользователей'
+        indexes = [
+            models.Index(
+                fields=['user', 'exam', '-started'],
+                name='progress_user_exam_idx'
+            ),
+            models.Index(
+                fields=['finished'],
+                name='progress_finished_idx'
+            )
+        ]
 
     def __str__(self):
         return f'{self.user} in exam: {self.exam_id} (stage: {self.stage})'
 
     def save(self, *args, **kwargs):
-        if self._state.adding:
+        adding = self._state.adding
+        if adding:
             self.started = timezone.now()
         super().save(*args, **kwargs)
+        if adding:
+            LatestProgress.objects.point(self)
+
+
+class LatestProgress(models.Model):
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        related_name='latest_progression',
+        on_delete=models.CASCADE
+    )
+    exam = models.ForeignKey(
+        Exam,
+        verbose_name='Тестирование',
+        related_name='latest_progress',
+        on_delete=models.CASCADE
+    )
+    progress = models.OneToOneField(
+        Progress,
+        verbose_name='Последняя попытка',
+        related_name='latest',
+        on_delete=models.CASCADE
+    )
+
+    objects = managers.LatestProgressManager()
+
+    class Meta:
+        verbose_name = 'Последняя попытка пользователя'
+        verbose_name_plural = 'Последние попытки пользователей'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'exam'], name='progress_latest_user_exam_uniq')
+        ]
+
+
+class ArchivedProgress(models.Model):
+    id = models.BigIntegerField(
+        verbose_name='Номер попытки',
+        primary_key=True
+    )
+    user = models.ForeignKey(
+        User,
+        verbose_name='Пользователь',
+        related_name='archived_progression',
+        on_delete=models.CASCADE
+    )
+    exam = models.ForeignKey(
+        Exam,
+        verbose_name='Тестирование',
+        related_name='archived_progress',
+        on_delete=models.CASCADE
+    )
+    exam_revision = models.DateTimeField(
+        verbose_name='Редакция тестирования',
+        null=True,
+        blank=True
+    )
+    started = models.DateTimeField(
+        verbose_name='Дата начала',
+        null=True
+    )
+    finished = models.DateTimeField(
+        verbose_name='Дата завершения'
+    )
+    passed = models.BooleanField(
+        verbose_name='Зачтено',
+        null=True
+    )
+    answers_count = models.PositiveIntegerField(
+        verbose_name='Ответов',
+        default=0
+    )
+    correct_count = models.PositiveIntegerField(
+        verbose_name='Верных ответов',
+        default=0
+    )
+    result = models.JSONField(
+        verbose_name='Итоги'
+    )
+
+    class Meta:
+        verbose_name = 'Архивная попытка'
+        verbose_name_plural = 'Архив попыток'
+
+    def __str__(self):
+        return f'{self.user} in exam: {self.exam_id} (archived)'
 
 
 class UserAnswer(models.Model):
@@ -66,7 +170,8 @@ class UserAnswer(models.Model):
         Progress,
         verbose_name='Прогресс',
         related_name='answers',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
     question = models.ForeignKey(
         Question,
@@ -83,6 +188,21 @@ class UserAnswer(models.Model):
         verbose_name='Без ответов',
         null=True,
     )
+    selected_ids = models.JSONField(
+        verbose_name='Выбранные варианты',
+        default=list,
+        blank=True
+    )
+    correct_ids = models.JSONField(
+        verbose_name='Верные варианты',
+        default=list,
+        blank=True
+    )
+    text = models.TextField(
+        verbose_name='Текст ответа',
+        null=True,
+        blank=True
+    )
     date = models.DateTimeField(
         verbose_name='Дата ответа',
         auto_now_add=True
@@ -94,36 +214,46 @@ class UserAnswer(models.Model):
         verbose_name = 'Ответ пользователя'
         verbose_name_plural = 'Ответы пользователей'
         ordering = ['date']
+        indexes = [
+            models.Index(
+                fields=['progress', 'question', 'date'],
+                name='progress_answer_question_idx'
+            )
+        ]
 
+    @property
+    def typed(self) -> bool:
+        return self.text is not None and not self.correct
 
-class UserVariant(models.Model):
-    answer = models.ForeignKey(
-        UserAnswer,
-        verbose_name='Ответ',
-        related_name='variants',
-        on_delete=models.CASCADE
-    )
-    variant = models.ForeignKey(
-        Variant,
-        verbose_name='Ответ',
-        related_name='answers',
-        null=True,
-        on_delete=models.SET_NULL
-    )
-    variant_text = models.TextField(
-        verbose_name='Вариант ответа',
-        null=True
-    )
-    selected = models.BooleanField(
-        verbose_name='Выбран пользователем',
-        default=False
-    )
-    correct = models.BooleanField(
-        verbose_name='Ответ верен',
-        default=False
-    )
+    @property
+    def selected_count(self) -> int:
+        return len(self.selected_ids) + self.typed
 
-    class Meta:
-        verbose_name = 'Вариант ответа пользователя'
-        verbose_name_plural = 'Варианты ответов пользователей'
-        ordering = ['-correct', '-selected']
+    @property
+    def corrected_count(self) -> int:
+        return len(set(self.selected_ids) & set(self.correct_ids))
+
+    def get_variants(
+            self,
+            variants: list,
+            selected_only: bool = False
+    ) -> list:
+        selected_ids = set(self.selected_ids)
+        correct_ids = set(self.correct_ids)
+        rows = [
+            {
+                'variant_text': variant.text,
+                'selected': variant.id in selected_ids,
+                'correct': variant.id in correct_ids
+            }
+            for variant in variants
+        ]
+        if self.typed:
+            rows.append({
+                'variant_text': self.text,
+                'selected': True,
+                'correct': False
+            })
+        if selected_only:
+            rows = [row for row in rows if row['selected']]
+        return sorted(rows, key=lambda row: not row['selected'])
@@ -0,0 +1,46 @@
+from .models import Progress, UserAnswer
+
+
+def build_result(progress_id: int) -> dict:
+    progress = (
+        Progress.objects
+        .filter(id=progress_id)
+        .get_details()
+        .get_percentage()
+        .get()
+    )
+    answers = (
+        UserAnswer.objects
+        .filter(progress=progress)
+        .get_counters()
+        .order_by('date')
+        .load_variants()
+    )
+    return {
+        'questions_count': progress.questions_count,
+        'correct_count': progress.correct_count,
+        'correct_percentage': progress.correct_percentage,
+        'answers': [
+            {
+                'question_text': answer.question_text,
+                'question_type': answer.question_type,
+                'exam_show_correct': answer.exam_show_correct,
+                'correct': answer.correct,
+                'no_answers': answer.no_answers,
+                'selected_count': answer.selected_count,
+                'corrected_count': answer.corrected_count,
+                'variants': answer.variants
+            }
+            for answer in answers
+        ]
+    }
+
+
+def store_result(progress_id: int) -> dict:
+    result = build_result(progress_id)
+    (
+        Progress.objects
+        .filter(id=progress_id, finished__isnull=False, result__isnull=True)
+        .update(result=result)
+    )
+    return result
@@ -1,29 +1,94 @@
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.views.generic import DetailView, ListView
 
+from core.budgets import query_budget
+from core.cache import get_versions
+from core.routers import read_only
+from core.views import make_etag
 from exams.models import Exam
+from exams.pages import CATALOG_PAGES
 from users.models import User
 
-from .models import Progress, UserAnswer, UserVariant
+from .models import ArchivedProgress, Progress
+from .results import build_result
 
 
+def get_finished_version(request: object, pk: int) -> tuple:
+    if not hasattr(request, 'finished_version'):
+        request.finished_version = (
+            Progress.objects
+            .filter(id=pk, finished__isnull=False)
+            .values_list('finished', 'exam__revision')
+            .first()
+        ) or (
+            ArchivedProgress.objects
+            .filter(id=pk)
+            .values_list('finished', 'exam__revision')
+            .first()
+        )
+    return request.finished_version
+
+
+def progress_etag(request: object, pk: int) -> str:
+    version = get_finished_version(request, pk)
+    if version is None:
+        return None
+    user = request.user
+    return make_etag(
+        pk, version, get_versions((CATALOG_PAGES,)),
+        user.pk, user.get_username()
+    )
+
+
+def progress_last_modified(request: object, pk: int) -> object:
+    version = get_finished_version(request, pk)
+    return version and max(filter(None, version))
+
+
+@query_budget(8)
+@read_only
+@method_decorator(condition(
+    etag_func=progress_etag, last_modified_func=progress_last_modified
+), name='dispatch')
 class ProgressDetailView(DetailView):
     model = Progress
     template_name = 'progress/progress_detail.html'
+    context_object_name = 'progress'
     slug_field = 'username'
     slug_url_kwarg = 'username'
 
-    def get_queryset(self):
-        progress_id = self.kwargs.get('pk')
+    def get_queryset(self, model=Progress):
         queryset = (
-            Progress.objects
-            .filter(id=progress_id)
-            .get_details(variants=UserVariant, answers=UserAnswer)
-            .get_percentage()
+            model.objects
+            .select_related('user', 'exam', 'exam__category')
+            .only('finished', 'result', 'user__username', 'exam__title',
+                  'exam__show_results', 'exam__success_message',
+                  'exam__category__title', 'exam__category__slug')
         )
         return queryset
 
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            return super().get_object(self.get_queryset(ArchivedProgress))
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        result = self.object.result
+
+        if result is None:
+            result = build_result(self.object.id)
+
+        context.update({'result': result})
+        return context
+
 
+@query_budget(6)
+@read_only
 class ProgressListView(ListView):
     model = Progress
     template_name = 'progress/progress_list.html'
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from users.models import Ranking
+
+
+class Command(BaseCommand):
+    help = 'Полностью пересчитывает рейтинг пользователей'
+
+    def handle(self, *args, **options):
+        count = Ranking.objects.refresh()
+        self.stdout.write(
+            self.style.SUCCESS(f'Рейтинг пересчитан для {count} пользователей')
+        )
@@ -1,7 +1,10 @@
+from django.apps import apps
 from django.contrib.auth.models import UserManager
+from django.db import transaction
 from django.db.models import (Count, ExpressionWrapper, F, IntegerField,
-                              OuterRef, Q, QuerySet, Subquery)
+                              Manager, OuterRef, Q, QuerySet, Subquery, Sum)
 from django.db.models.expressions import Window
+from django.db.models.functions import Coalesce
 from django.db.models.functions.comparison import NullIf
 from django.db.models.functions.window import DenseRank
 
@@ -9,6 +12,16 @@ from django.db.models.functions.window import DenseRank
 class UserQuerySet(QuerySet):
 
     def with_progress(self) -> object:
+        archived = (
+            apps.get_model('progress', 'ArchivedProgress').objects
+            .filter(user=OuterRef('id'))
+            .order_by()
+            .values('user')
+            .annotate(
+                total=Sum('answers_count'),
+                correct=Sum('correct_count')
+            )
+        )
         progress = (
             self
             .annotate(
@@ -18,16 +31,7 @@ class UserQuerySet(QuerySet):
                 )),
                 passed_count=Count(
                     'progression__exam', distinct=True, filter=Q(
-                        progression__id__in=Subquery(
-                            self
-                            .filter(progression__user_id=OuterRef('id'))
-                            .order_by(
-                                'progression__exam__id',
-                                '-progression__started'
-                            )
-                            .distinct('progression__exam__id')
-                            .values('progression__id')
-                        ),
+                        progression__latest__isnull=False,
                         progression__user_id=F('id'),
                         progression__passed=True
                     )),
@@ -35,25 +39,18 @@ class UserQuerySet(QuerySet):
                     Count('progression__answers', distinct=True, filter=Q(
                         progression__user_id=F('id'),
                         progression__answers__correct=True
-                    )), 0) * 100
+                    )) + Coalesce(Subquery(archived.values('correct')), 0), 0)
+                    * 100
                     / NullIf(Count(
                         'progression__answers', distinct=True,
                         filter=Q(
                             progression__user_id=F('id'),
-                        )), 0), output_field=IntegerField()
+                        )) + Coalesce(Subquery(archived.values('total')), 0),
+                        0), output_field=IntegerField()
                 ),
                 points=ExpressionWrapper(
                     Count('progression__answers', distinct=True, filter=Q(
-                        progression__id__in=Subquery(
-                            self
-                            .filter(progression__user_id=OuterRef('id'))
-                            .order_by(
-                                'progression__exam__id',
-                                '-progression__started'
-                            )
-                            .distinct('progression__exam__id')
-                            .values('progression__id')
-                        ),
+                        progression__latest__isnull=False,
                         progression__answers__correct=True,
                         progression__passed=True
                     )) * 10, output_field=IntegerField()
@@ -77,6 +74,18 @@ class UserQuerySet(QuerySet):
         )
         return rank
 
+    def with_ranking(self):
+        ranking = (
+            self
+            .annotate(
+                points=F('ranking__points'),
+                passed_count=F('ranking__passed_count'),
+                correct_percentage=F('ranking__correct_percentage'),
+                exams_count=F('ranking__exams_count')
+            )
+        )
+        return ranking
+
 
 class UserManager(UserManager):
 
@@ -88,3 +97,111 @@ class UserManager(UserManager):
 
     def get_rank(self):
         return self.get_queryset().get_rank()
+
+    def with_ranking(self):
+        return self.get_queryset().with_ranking()
+
+
+class RankingManager(Manager):
+    stats_fields = (
+        'points', 'passed_count', 'correct_percentage', 'exams_count'
+    )
+    ordering = (
+        F('points').desc(),
+        F('passed_count').desc(),
+        F('correct_percentage').desc(nulls_first=True),
+        F('exams_count').desc(),
+        F('date_joined').asc(),
+        F('pk').asc()
+    )
+
+    def get_stats(self, users: object) -> object:
+        stats = (
+            users
+            .filter(is_active=True)
+            .with_progress()
+            .values('id', 'date_joined', *self.stats_fields)
+        )
+        return stats
+
+    def get_ahead(self, entry: dict) -> Q:
+        points = entry['points']
+        passed_count = entry['passed_count']
+        correct_percentage = entry['correct_percentage']
+
+        if correct_percentage is None:
+            percentage_ahead = Q(pk__in=[])
+            percentage_equal = Q(correct_percentage__isnull=True)
+        else:
+            percentage_ahead = (
+                Q(correct_percentage__isnull=True)
+                | Q(correct_percentage__gt=correct_percentage)
+            )
+            percentage_equal = Q(correct_percentage=correct_percentage)
+
+        ahead = (
+            Q(points__gt=points)
+            | Q(points=points, passed_count__gt=passed_count)
+            | (Q(points=points, passed_count=passed_count) & percentage_ahead)
+            | (Q(points=points, passed_count=passed_count,
+                 exams_count__gt=entry['exams_count']) & percentage_equal)
+        )
+        return ahead
+
+    def get_rank(self, entry: dict) -> int:
+        ahead = (
+            self
+            .filter(self.get_ahead(entry))
+            .order_by()
+            .values(*self.stats_fields)
+            .distinct()
+            .count()
+        )
+        return ahead + 1
+
+    def set_ranks(self, users: list) -> list:
+        rank = None
+        previous = None
+
+        for user in users:
+            entry = {
+                field: getattr(user, field) for field in self.stats_fields
+            }
+            if rank is None:
+                rank = self.get_rank(entry)
+            elif entry != previous:
+                rank += 1
+            user.rank = rank
+            previous = entry
+        return users
+
+    def refresh_user(self, user_id: int) -> None:
+        users = self.model._meta.get_field('user').related_model.objects
+        entry = self.get_stats(users.filter(id=user_id)).first()
+
+        if entry is None:
+            self.filter(pk=user_id).delete()
+            return
+
+        defaults = {
+            'date_joined': entry['date_joined'],
+            **{field: entry[field] for field in self.stats_fields}
+        }
+        if not self.filter(pk=user_id).update(**defaults):
+            self.get_or_create(user_id=user_id, defaults=defaults)
+
+    def refresh(self) -> int:
+        users = self.model._meta.get_field('user').related_model.objects
+        ranking = [
+            self.model(
+                user_id=entry['id'],
+                date_joined=entry['date_joined'],
+                **{field: entry[field] for field in self.stats_fields}
+            )
+            for entry in self.get_stats(users.all())
+        ]
+
+        with transaction.atomic():
+            self.all().delete()
+            self.bulk_create(ranking, batch_size=1000)
+        return len(ranking)
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.16 on 2026-10-18 04:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Ranking',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ranking', serialize=False, to='users.user', verbose_name='Пользователь')),
+                ('rank', models.PositiveIntegerField(db_index=True, verbose_name='Позиция')),
+                ('points', models.PositiveIntegerField(default=0, verbose_name='Баллов')),
+                ('passed_count', models.PositiveIntegerField(default=0, verbose_name='Зачтено')),
+                ('correct_percentage', models.PositiveIntegerField(null=True, verbose_name='Верных ответов')),
+                ('exams_count', models.PositiveIntegerField(default=0, verbose_name='Завершено тестов')),
+                ('date_joined', models.DateTimeField(verbose_name='Дата регистрации')),
+            ],
+            options={
+                'verbose_name': 'Позиция в рейтинге',
+                'verbose_name_plural': 'Рейтинг',
+                'ordering': ['rank'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ranking',
+            index=models.Index(fields=['-points', '-passed_count', '-correct_percentage', '-exams_count', 'date_joined'], name='users_ranking_order_idx'),
+        ),
+    ]
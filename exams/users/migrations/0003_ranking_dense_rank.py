@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-18 06:00
+
+from django.db import migrations, models
+import django.db.models.expressions
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_ranking'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='ranking',
+            options={'ordering': [django.db.models.expressions.OrderBy(django.db.models.expressions.F('points'), descending=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('passed_count'), descending=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('correct_percentage'), descending=True, nulls_first=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('exams_count'), descending=True), django.db.models.expressions.OrderBy(django.db.models.expressions.F('date_joined')), django.db.models.expressions.OrderBy(django.db.models.expressions.F('pk'))], 'verbose_name': 'Позиция в рейтинге', 'verbose_name_plural': 'Рейтинг'},
+        ),
+        migrations.RemoveIndex(
+            model_name='ranking',
+            name='users_ranking_order_idx',
+        ),
+        migrations.RemoveField(
+            model_name='ranking',
+            name='rank',
+        ),
+        migrations.AddIndex(
+            model_name='ranking',
+            index=models.Index(fields=['-points', '-passed_count', '-correct_percentage', '-exams_count', 'date_joined', 'user'], name='users_ranking_order_idx'),
+        ),
+    ]
@@ -2,7 +2,7 @@ from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.urls import reverse
 
-from .managers import UserManager
+from .managers import RankingManager, UserManager
 
 
 class User(AbstractUser):
@@ -27,15 +27,18 @@ class User(AbstractUser):
 
     @property
     def position_of_rankings(self):
-        ranks = (
-            User.objects
-            .filter(is_active=True)
-            .with_progress()
-            .get_rank()
-            .order_by('rank')
-            .values_list('id', flat=True)
-        )
-        return list(ranks).index(self.id) + 1
+        fields = Ranking.objects.stats_fields
+        entry = {field: getattr(self, field, None) for field in fields}
+        if entry['points'] is None:
+            entry = (
+                Ranking.objects
+                .filter(user=self)
+                .values(*fields)
+                .first()
+            )
+        if entry is None:
+            return None
+        return Ranking.objects.get_rank(entry)
 
     class Meta:
         verbose_name = 'Пользователь'
@@ -50,3 +53,51 @@ class User(AbstractUser):
     def save(self, *args, **kwargs):
         self.email = self.email.lower()
         super().save(*args, **kwargs)
+
+
+class Ranking(models.Model):
+    user = models.OneToOneField(
+        User,
+        verbose_name='Пользователь',
+        related_name='ranking',
+        primary_key=True,
+        on_delete=models.CASCADE
+    )
+    points = models.PositiveIntegerField(
+        verbose_name='Баллов',
+        default=0
+    )
+    passed_count = models.PositiveIntegerField(
+        verbose_name='Зачтено',
+        default=0
+    )
+    correct_percentage = models.PositiveIntegerField(
+        verbose_name='Верных ответов',
+        null=True
+    )
+    exams_count = models.PositiveIntegerField(
+        verbose_name='Завершено тестов',
+        default=0
+    )
+    date_joined = models.DateTimeField(
+        verbose_name='Дата регистрации'
+    )
+
+    objects = RankingManager()
+
+    class Meta:
+        verbose_name = 'Позиция в рейтинге'
+        verbose_name_plural = 'Рейтинг'
+        ordering = list(RankingManager.ordering)
+        indexes = [
+            models.Index(
+                fields=[
+                    '-points', '-passed_count', '-correct_percentage',
+                    '-exams_count', 'date_joined', 'user'
+                ],
+                name='users_ranking_order_idx'
+            )
+        ]
+
+    def __str__(self):
+        return f'{self.user_id}: {self.points}'
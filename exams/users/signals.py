@@ -0,0 +1,13 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Ranking, User
+
+
+@receiver(post_save, sender=User)
+def ranking_user_change(sender, instance, created, update_fields, **kwargs):
+    if update_fields and 'is_active' not in update_fields:
+        return
+    ranked = Ranking.objects.filter(user=instance).exists()
+    if created or instance.is_active != ranked:
+        Ranking.objects.refresh_user(instance.id)
@@ -0,0 +1,71 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from users.models import Ranking, User
+
+STATS = {
+    'alice': (370, 3, 90, 4),
+    'bob': (370, 3, 90, 4),
+    'carol': (370, 3, None, 4),
+    'dave': (370, 2, 95, 5),
+    'erin': (100, 1, 50, 1),
+    'frank': (0, 0, None, 0),
+    'grace': (0, 0, 0, 1),
+}
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    'LOCATION': 'rankings'
+}})
+class RankingTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for username, stats in STATS.items():
+            user = User.objects.create_user(
+                email=f'{username}@example.com', username=username,
+                password='password')
+            Ranking.objects.filter(user=user).update(
+                **dict(zip(Ranking.objects.stats_fields, stats)))
+
+    def get_ranks(self):
+        users = Ranking.objects.set_ranks(list(
+            User.objects.with_ranking()
+            .filter(ranking__isnull=False)
+            .order_by(*Ranking.objects.ordering)
+        ))
+        return {user.username: user.rank for user in users}
+
+    def test_dense_rank(self):
+        self.assertEqual(self.get_ranks(), {
+            'carol': 1, 'alice': 2, 'bob': 2, 'dave': 3, 'erin': 4,
+            'frank': 5, 'grace': 6,
+        })
+
+    def test_position_matches_page(self):
+        ranks = self.get_ranks()
+        for user in User.objects.all():
+            with self.subTest(username=user.username):
+                self.assertEqual(
+                    user.position_of_rankings, ranks[user.username])
+                self.assertEqual(
+                    User.objects.with_ranking().get(id=user.id)
+                    .position_of_rankings,
+                    ranks[user.username]
+                )
+
+    def test_rank_follows_refreshed_stats(self):
+        Ranking.objects.filter(user__username='erin').update(points=400)
+        ranks = self.get_ranks()
+        self.assertEqual(ranks['erin'], 1)
+        self.assertEqual(ranks['carol'], 2)
+        self.assertEqual(ranks['grace'], 6)
+
+    def test_rankings_page(self):
+        response = self.client.get(reverse('users:users_rankings'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(user.username, user.rank) for user in response.context['users']],
+            list(self.get_ranks().items())
+        )
@@ -7,6 +7,8 @@ from django.contrib.auth.views import (LoginView, LogoutView,
                                        PasswordResetView)
 from django.urls import path, reverse_lazy
 
+from core.budgets import query_budget
+
 from . import views
 
 app_name = 'users'
@@ -14,10 +16,10 @@ app_name = 'users'
 urlpatterns = [
     path(
         'logout/',
-        LogoutView.as_view(
+        query_budget(5)(LogoutView.as_view(
             template_name='users/logout.html',
             next_page='exams:index'
-        ),
+        )),
         name='logout'
     ),
     path('signup/',
@@ -25,45 +27,45 @@ urlpatterns = [
          name='signup'),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        query_budget(6)(LoginView.as_view(template_name='users/login.html')),
         name='login'
     ),
     path('password_reset/',
-         PasswordResetView.as_view(
+         query_budget(6)(PasswordResetView.as_view(
              template_name="users/password_reset_form.html",
              email_template_name='users/password_reset_email.html',
-             success_url=reverse_lazy('users:password_reset_done')),
+             success_url=reverse_lazy('users:password_reset_done'))),
          name='password_reset_form'),
     path(
         'password_reset/done/',
-        PasswordResetDoneView.as_view(
-            template_name='users/password_reset_done.html'),
+        query_budget(4)(PasswordResetDoneView.as_view(
+            template_name='users/password_reset_done.html')),
         name='password_reset_done'
     ),
     path(
         'password_reset/<uidb64>/<token>/',
-        PasswordResetConfirmView.as_view(
+        query_budget(6)(PasswordResetConfirmView.as_view(
             template_name='users/password_reset_confirm.html',
-            success_url=reverse_lazy('users:password_reset_complete')),
+            success_url=reverse_lazy('users:password_reset_complete'))),
         name='password_reset_confirm'
     ),
     path(
         'password_reset/complete/',
-        PasswordResetCompleteView.as_view(
-            template_name='users/password_change_complete.html'),
+        query_budget(4)(PasswordResetCompleteView.as_view(
+            template_name='users/password_change_complete.html')),
         name='password_reset_complete'
     ),
     path(
         'password-change/',
-        PasswordChangeView.as_view(
+        query_budget(6)(PasswordChangeView.as_view(
             template_name='users/password_change_form.html',
-            success_url=reverse_lazy('users:password_change_done')),
+            success_url=reverse_lazy('users:password_change_done'))),
         name='password_change_form'
     ),
     path(
         'password-change/done/',
-        PasswordChangeDoneView.as_view(
-            template_name='users/password_change_done.html'),
+        query_budget(4)(PasswordChangeDoneView.as_view(
+            template_name='users/password_change_done.html')),
         name='password_change_done'
     ),
     path('@<slug:username>/', views.UserProfileView.as_view(), name='profile'),
@@ -1,15 +1,22 @@
+from django.conf import settings
 from django.contrib.auth import login
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils.functional import cached_property
 from django.views.generic import CreateView, DetailView, ListView, UpdateView
 
+from core.budgets import query_budget
+from core.cache import get_or_compute
+from core.routers import read_only
 from exams.models import Exam
 
 from .forms import SignupForm
-from .models import User
+from .models import Ranking, User
 
 
+@query_budget(22)
 class SignupView(CreateView):
     form_class = SignupForm
     success_url = reverse_lazy('exams:index')
@@ -21,6 +28,8 @@ class SignupView(CreateView):
         return valid
 
 
+@query_budget(6)
+@read_only
 class UserProfileView(DetailView):
     model = User
     template_name = 'users/profile.html'
@@ -34,7 +43,7 @@ class UserProfileView(DetailView):
             .only(
                 'username', 'date_joined', 'about', 'first_name', 'last_name'
             )
-            .with_progress()
+            .with_ranking()
         )
         return get_object_or_404(user)
 
@@ -54,6 +63,7 @@ class UserProfileView(DetailView):
         return context
 
 
+@query_budget(6)
 class UserEditView(LoginRequiredMixin, UpdateView):
     model = User
     fields = ['first_name', 'last_name', 'hide_finished_exams', 'about']
@@ -65,21 +75,45 @@ class UserEditView(LoginRequiredMixin, UpdateView):
         return self.request.user
 
 
+class RankingPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        return get_or_compute(
+            'rankings:count',
+            self.object_list.count,
+            settings.RANKINGS_TIMEOUT
+        )
+
+
+@query_budget(10)
+@read_only
 class RankingListView(ListView):
     model = User
     template_name = 'users/rankings.html'
     context_object_name = 'users'
     paginate_by = 50
+    paginator_class = RankingPaginator
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        context['users'] = get_or_compute(
+            f'rankings:page:{page.number}',
+            lambda: Ranking.objects.set_ranks(list(page.object_list)),
+            settings.RANKINGS_TIMEOUT
+        )
+        return context
 
     def get_queryset(self):
         queryset = (
             User.objects
             .filter(is_active=True)
-            .with_progress()
-            .get_rank()
+            .with_ranking()
+            .filter(ranking__isnull=False)
             .only(
                 'username', 'date_joined', 'about', 'first_name', 'last_name'
             )
-            .order_by('rank')
+            .order_by(*Ranking.objects.ordering)
         )
         return queryset